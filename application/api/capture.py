@@ -0,0 +1,157 @@
+# application/api/capture.py
+"""
+Capture of inbound webhook traffic for replay benchmarks
+"""
+
+import asyncio
+import gzip
+import hashlib
+import os
+import re
+import secrets
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+from application.core import codec
+from application.core.config import settings
+from application.core.log import logger
+from application.core.metrics import metrics
+
+# Keys whose values identify a person
+PII_KEYS = frozenset({
+    "phone", "phone_number", "first_name", "last_name", "full_name", "username", "vcard",
+})
+
+# Phone numbers typed as plain text (e.g. in the BotNumber.contact step)
+_PHONE_RE = re.compile(r"\+?\d[\d\s\-()]{7,}\d")
+
+
+class Scrubber:
+    """Replaces personal fields with stable, salted pseudonyms"""
+
+    def __init__(self, salt: Optional[bytes] = None):
+        # Random per process: pseudonyms are consistent within a capture only
+        self._salt = salt or secrets.token_bytes(16)
+
+    def _pseudonym(self, key: str, value: str) -> str:
+        digest = hashlib.blake2s(value.encode("utf-8"), key=self._salt, digest_size=4).hexdigest()
+        return f"{key}_{digest}"
+
+    @staticmethod
+    def _mask_phone(match: "re.Match") -> str:
+        text = match.group(0)
+        # Keep the country prefix and shape so validators still see a phone
+        head, tail = text[:4], text[4:]
+        return head + re.sub(r"\d", "0", tail)
+
+    def scrub(self, value: Any, key: str = "") -> Any:
+        if isinstance(value, dict):
+            return {k: self.scrub(v, k) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.scrub(v, key) for v in value]
+        if isinstance(value, str):
+            if key in PII_KEYS:
+                if key in ("phone", "phone_number"):
+                    return _PHONE_RE.sub(self._mask_phone, value)
+                return self._pseudonym(key, value)
+            if key in ("text", "caption"):
+                return _PHONE_RE.sub(self._mask_phone, value)
+        return value
+
+
+class TrafficRecorder:
+    """
+    Appends ``{"ts", "path", "body"}`` records to gzip'd JSONL files.
+
+    Records are buffered in memory and written by a background task off the
+    event loop; files rotate by uncompressed size or age.
+    """
+
+    def __init__(self, directory: str, rotate_bytes: int, rotate_seconds: int, flush_interval: float = 1.0):
+        self.directory = Path(directory)
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.flush_interval = flush_interval
+        self.scrubber = Scrubber()
+        self._buffer: List[bytes] = []
+        self._file: Optional[gzip.GzipFile] = None
+        self._file_bytes = 0
+        self._file_opened = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+        self._records = metrics.counter("capture_records_total", "Requests captured for replay")
+
+    @property
+    def enabled(self) -> bool:
+        return self._task is not None
+
+    # ==================== LIFECYCLE ====================
+
+    async def start(self) -> None:
+        if self._task is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._task = asyncio.create_task(self._flush_loop(), name="capture-writer")
+            logger.info(f"🎥 Capturing webhook traffic to {self.directory}")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self._flush()
+        if self._file:
+            await asyncio.to_thread(self._file.close)
+            self._file = None
+
+    # ==================== RECORDING ====================
+
+    def record(self, path: str, body: Union[bytes, dict]) -> None:
+        """Scrub and buffer one request body (no-op when capture is off)"""
+        if not self.enabled:
+            return
+        try:
+            data = codec.loads(body) if isinstance(body, (bytes, bytearray)) else body
+        except ValueError:
+            return
+        line = codec.dumps({"ts": time.time(), "path": path, "body": self.scrubber.scrub(data)})
+        self._buffer.append(line + b"\n")
+        self._records.inc(path=path)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self._flush()
+            except Exception as e:
+                logger.error(f"❌ Capture flush failed: {e}")
+
+    async def _flush(self) -> None:
+        if not self._buffer:
+            return
+        lines, self._buffer = self._buffer, []
+        await asyncio.to_thread(self._write, lines)
+
+    def _write(self, lines: List[bytes]) -> None:
+        now = time.time()
+        if self._file and (self._file_bytes >= self.rotate_bytes or now - self._file_opened >= self.rotate_seconds):
+            self._file.close()
+            self._file = None
+        if self._file is None:
+            name = f"capture-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.jsonl.gz"
+            self._file = gzip.open(self.directory / name, "ab")
+            self._file_bytes = 0
+            self._file_opened = now
+        chunk = b"".join(lines)
+        self._file.write(chunk)
+        self._file.flush()
+        self._file_bytes += len(chunk)
+
+
+# Singleton instance
+recorder = TrafficRecorder(
+    directory=settings.CAPTURE_DIR,
+    rotate_bytes=settings.CAPTURE_ROTATE_BYTES,
+    rotate_seconds=settings.CAPTURE_ROTATE_SECONDS,
+)
@@ -1,57 +1,153 @@
-import json
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from application.bot_app.keyboards.inline import in_car_inl, rate_trip_inl
-from application.core import bot, t
+from application.core import codec, t
+from application.core.config import settings
+from application.database.order_state import Transition, order_states
+from application.dispatch.delivery import Delivery, delivery_queue
+from .responses import CodecJSONResponse
+from .schemas import ArrivedEvent, AssignedEvent, Car, DriverEvent, EndedEvent, decode_driver_event, validate_driver_event
+
+
+def _render_assigned(event: AssignedEvent, lang: str) -> Delivery:
+    driver = event.driver_details
+    # Drivers without a registered car still get a notification
+    car = driver.cars[0] if driver.cars else Car(car_model="—", car_number="—")
+    text = t("find_driver", lang,
+             order_id=event.id or 0,
+             full_name=driver.full_name,
+             car_model=car.car_model,
+             car_number=car.car_number,
+             phone=driver.phone,
+             rating=driver.rating,
+             from_city=(driver.from_location or "").title(),
+             to_city=(driver.to_location or "").title(),
+             passenger=event.content_object.passenger,
+             price=event.content_object.price)
+    return Delivery(event.user, text, kind=event.status, order_id=event.order_id)
+
+
+def _render_arrived(event: ArrivedEvent, lang: str) -> Delivery:
+    return Delivery(event.user, t("driver_arrived", lang),
+                    reply_markup=in_car_inl(lang, order_id=event.id),
+                    kind=event.status, order_id=event.order_id)
+
+
+def _render_ended(event: EndedEvent, lang: str) -> Delivery:
+    return Delivery(event.user, t("rate_trip", lang),
+                    reply_markup=rate_trip_inl(lang, order_id=event.content_object.id),
+                    kind=event.status, order_id=event.order_id)
+
+
+# status -> renderer; only the matching template's arguments are built
+RENDERERS: Dict[str, Callable[..., Delivery]] = {
+    "assigned": _render_assigned,
+    "arrived": _render_arrived,
+    "ended": _render_ended,
+}
+
+
+def render(event: DriverEvent) -> Delivery:
+    """Build the passenger notification for a decoded driver event"""
+    return RENDERERS[event.status](event, event.creator.language)
+
+
+def render_driver_event(body: bytes) -> Optional[Delivery]:
+    """
+    Decode a driver event and build the passenger notification (None for
+    statuses the passenger is not notified about)
+
+    Raises:
+        ValueError: the event is malformed
+    """
+    event = decode_driver_event(body)
+    return render(event) if event is not None else None
+
+
+async def accept_driver_event(event: Optional[DriverEvent]) -> Tuple[str, int]:
+    """Run one decoded event through the state machine onto the delivery queue"""
+    if event is None:
+        return "ignored", 200
+    if event.order_id is None:
+        # No order to track: notify, but keep it out of the shared state machine
+        return ("accepted", 202) if delivery_queue.put(render(event)) else ("busy", 503)
+
+    # Resent or late statuses are dropped before anything is rendered
+    transition, previous = await order_states.advance(event.order_id, event.status)
+    if transition is not Transition.ADVANCED:
+        return transition.value, 200
+
+    if not delivery_queue.put(render(event)):
+        # Let the backend's retry through the state machine again
+        await order_states.rollback(event.order_id, event.status, previous)
+        return "busy", 503
+
+    return "accepted", 202
 
 
 async def driver_response(request):
+    """Validate a backend driver event, queue the notification and answer 202"""
     notify = await request.body()
-    data = json.loads(notify)
-    driver = data.get('driver_details', {})
-    car = driver.get('cars', [])[0]
-    content_object = data.get('content_object', {})
-    lang = data.get("creator", {}).get("language", "uz")
-
-    if data.get("status") == "assigned":
-        text = t("find_driver", lang,
-                 order_id=data.get("id", 0),
-                 full_name=driver.get('full_name', None),
-                 car_model=car.get('car_model', None),
-                 car_number=car.get('car_number', None),
-                 phone=driver.get('phone', None),
-                 rating=driver.get('rating', None),
-                 from_city=driver.get('from_location', "").title(),
-                 to_city=driver.get('to_location', "").title(),
-                 passenger=content_object.get('passenger', None),
-                 price=content_object.get('price', None))
+    try:
+        event = decode_driver_event(notify)
+    except ValueError as e:
+        return CodecJSONResponse({"status": "error", "error": str(e)}, status_code=400)
 
+    status, code = await accept_driver_event(event)
+    return CodecJSONResponse({"status": status}, status_code=code)
+
+
+async def driver_batch_response(request):
+    """
+    Accept an array of driver events in one request
+
+    Items are validated independently. Events for different orders are
+    accepted concurrently, those for one order in array order; the
+    response lists one result per item, in order. Sending goes through the
+    delivery queue like single events.
+
+    Status: 202 if any item was accepted; the backend should resend only
+    the items whose code is 503 (delivery queue full). 503 if none was
+    accepted and at least one was refused for backpressure, so the whole
+    batch is retried like a single event. 200 otherwise (everything was
+    ignored, a duplicate, stale or invalid).
+    """
+    try:
+        items = codec.loads(await request.body())
+    except ValueError as e:
+        return CodecJSONResponse({"status": "error", "error": str(e)}, status_code=400)
+    if not isinstance(items, list):
+        return CodecJSONResponse({"status": "error", "error": "Expected a JSON array"}, status_code=400)
+    if len(items) > settings.DRIVER_BATCH_MAX:
+        return CodecJSONResponse(
+            {"status": "error", "error": f"At most {settings.DRIVER_BATCH_MAX} events per batch"},
+            status_code=413
+        )
+
+    results: List[Optional[dict]] = [None] * len(items)
+    # order id (or the item's own index) -> indexes of its events, in array order
+    groups: Dict[Any, List[int]] = {}
+    events: List[Optional[DriverEvent]] = [None] * len(items)
+    for i, item in enumerate(items):
         try:
-            await bot.send_message(
-                chat_id=data["user"],
-                text=text)
-        except Exception as e:
-            print(e)
-
-    if data.get("status") == "arrived":
-        text_arrived = t("driver_arrived", lang)
-        try:
-            await bot.send_message(
-                data["user"],
-                text_arrived,
-                reply_markup=in_car_inl(lang, order_id=data["id"])
-            )
-        except Exception as e:
-            print(e)
-
-    if data.get("status") == "ended":
-        text_ended = t("rate_trip", lang)
-        try:
-            await bot.send_message(
-                data["user"],
-                text_ended,
-                reply_markup=rate_trip_inl(lang, order_id=data["content_object"]['id'])
-            )
-        except Exception as e:
-            print(e)
+            events[i] = validate_driver_event(item)
+        except ValueError as e:
+            results[i] = {"status": "error", "code": 400, "error": str(e)}
+            continue
+        order_id = events[i].order_id if events[i] is not None else None
+        groups.setdefault(("order", order_id) if order_id is not None else ("item", i), []).append(i)
 
+    async def accept(indexes: List[int]) -> None:
+        # One order's events go through the state machine one after another
+        for i in indexes:
+            status, code = await accept_driver_event(events[i])
+            results[i] = {"status": status, "code": code}
 
+    await asyncio.gather(*(accept(indexes) for indexes in groups.values()))
+    accepted = sum(1 for r in results if r["code"] == 202)
+    if accepted:
+        code = 202
+    else:
+        code = 503 if any(r["code"] == 503 for r in results) else 200
+    return CodecJSONResponse({"accepted": accepted, "results": results}, status_code=code)
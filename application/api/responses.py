@@ -0,0 +1,17 @@
+# application/api/responses.py
+"""
+Response classes that serialise with the shared JSON codec
+"""
+
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+from application.core import codec
+
+
+class CodecJSONResponse(JSONResponse):
+    """JSONResponse rendered by codec.dumps (bytes straight from the fast codec)"""
+
+    def render(self, content: Any) -> bytes:
+        return codec.dumps(content)
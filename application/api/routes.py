@@ -1,14 +1,26 @@
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
 from starlette.requests import Request
-from starlette.responses import JSONResponse
-from telebot.types import Update
+from starlette.responses import JSONResponse, PlainTextResponse
 
-from .driver_found import driver_response
+from .capture import recorder
+from .driver_found import driver_response, driver_batch_response
 from ..core.bot import bot
 from ..core.config import settings
 from ..core.log import logger
+from ..core.metrics import metrics
+from ..dispatch import (update_queue, decode_update, admission, Decision, journal, delivery_queue, send_scheduler,
+                        dead_letters)
 from ..database.cache import cache
-from ..core.i18n import t
+from ..database.order_state import order_states
+from ..core.i18n import t, reload_translations, get_available_languages
+from ..services.breaker import breakers
+from ..services.response_cache import response_cache
+from ..services.singleflight import single_flight
+from ..services.hedging import hedger
+from ..services.http_client import GlobalHTTPClient
+from ..services.tracing import connection_stats, latency_stats
 from ..services.user_service import UserService, TelegramUser
 
 router = APIRouter()
@@ -51,14 +63,81 @@ async def translate(key: str, lang: str = "en"):
     }
 
 
+@router.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus metrics."""
+    return PlainTextResponse(metrics.render())
+
+
+@router.get("/metrics/updates")
+async def update_queue_stats():
+    """Update queue and admission stats for sizing the worker pool."""
+    return {**update_queue.stats(), "admission": admission.stats()}
+
+
+@router.get("/metrics/journal")
+async def journal_stats():
+    """Redis Streams journal stats (length, pending per consumer)."""
+    if not settings.UPDATE_JOURNAL_ENABLED:
+        return {"enabled": False}
+    return {"enabled": True, **await journal.stats()}
+
+
+@router.get("/metrics/sends")
+async def send_stats():
+    """Outbound Bot API pacing: achieved rate, wait p95, 429 count."""
+    return send_scheduler.stats()
+
+
+@router.get("/metrics/delivery")
+async def delivery_stats():
+    """Outbound delivery queue stats (depth, retries, accept-to-send latency)."""
+    return {**delivery_queue.stats(), "orders": order_states.stats()}
+
+
+@router.get("/metrics/backend")
+async def backend_stats():
+    """Backend API client: pool, latency, circuit breakers, coalescing, response cache, hedging."""
+    return {
+        "pool": {**GlobalHTTPClient().pool_stats(), **connection_stats()},
+        "latency": latency_stats(),
+        "circuits": breakers.stats(),
+        "single_flight": single_flight.stats(),
+        "cache": response_cache.stats(),
+        "hedging": hedger.stats(),
+    }
+
+
 @router.post("/webhook")
 async def webhook(request: Request):
-    """ webhook endpoint."""
+    """ webhook endpoint: validate, enqueue and acknowledge immediately."""
     try:
-        update = await request.body()
-        await bot.process_new_updates([Update.de_json(update.decode("utf-8"))])
-    except Exception as e:
-        return {"status": "error", "error": str(e)}
+        body = await request.body()
+        data = decode_update(body)
+    except ValueError as e:
+        return JSONResponse({"status": "error", "error": str(e)}, status_code=400)
+
+    recorder.record("/webhook", data)
+
+    if settings.UPDATE_JOURNAL_ENABLED:
+        # Durable mode: consumer-group workers pick it up from the stream
+        try:
+            await journal.append(body)
+        except Exception as e:
+            logger.error(f"❌ Journal append failed: {e}")
+            return JSONResponse({"status": "busy"}, status_code=503)
+        return {"status": "ok"}
+
+    decision = admission.admit(data)
+    if decision is not Decision.ADMIT:
+        # Shed on purpose: acknowledge so Telegram does not redeliver
+        return {"status": decision.value}
+
+    if not update_queue.put(data):
+        # Telegram retries non-2xx responses, so the update is not lost
+        return JSONResponse({"status": "busy"}, status_code=503)
+
+    return {"status": "ok"}
 
 
 @router.get("/set-webhook")
@@ -136,8 +215,50 @@ async def set_webhooks(request: Request):
         )
 
 
+def _check_admin(token: Optional[str]) -> None:
+    if not settings.ADMIN_API_TOKEN or token != settings.ADMIN_API_TOKEN:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@router.post("/i18n/reload")
+async def i18n_reload(x_admin_token: Optional[str] = Header(None)):
+    """Re-read locale files and propagate them to every worker process."""
+    _check_admin(x_admin_token)
+    await reload_translations(cache.client)
+    return {"status": "ok", "languages": get_available_languages()}
+
+
+@router.get("/admin/dead-letters")
+async def dead_letter_list(offset: int = 0, limit: int = 50, x_admin_token: Optional[str] = Header(None)):
+    """Failed deliveries, oldest first, with error class and attempt count."""
+    _check_admin(x_admin_token)
+    limit = max(1, min(limit, 500))
+    return {"total": await dead_letters.count(), "items": await dead_letters.list(offset, limit)}
+
+
+@router.post("/admin/dead-letters/replay")
+async def dead_letter_replay(limit: Optional[int] = None, x_admin_token: Optional[str] = Header(None)):
+    """Re-queue dead letters; sends are paced by the delivery queue and send scheduler."""
+    _check_admin(x_admin_token)
+    return await dead_letters.replay(delivery_queue, limit)
+
+
+@router.delete("/admin/dead-letters")
+async def dead_letter_purge(x_admin_token: Optional[str] = Header(None)):
+    """Drop every dead letter."""
+    _check_admin(x_admin_token)
+    return {"purged": await dead_letters.purge()}
+
+
 @router.post("/passenger")
 async def driver_web(request: Request):
+    recorder.record("/passenger", await request.body())
     return await driver_response(request)
 
 
+@router.post("/passenger/batch")
+async def driver_web_batch(request: Request):
+    recorder.record("/passenger/batch", await request.body())
+    return await driver_batch_response(request)
+
+
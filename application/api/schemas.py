@@ -0,0 +1,115 @@
+# application/api/schemas.py
+"""
+Typed payloads pushed to us by the backend
+"""
+
+from typing import Annotated, Any, List, Literal, Optional, Union
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+
+# Numbers arrive as JSON numbers or as Decimal strings from the backend
+Scalar = Union[int, float, str, None]
+
+
+class _Payload(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+
+class Car(_Payload):
+    car_model: Optional[str] = None
+    car_number: Optional[str] = None
+
+
+class DriverDetails(_Payload):
+    full_name: Optional[str] = None
+    phone: Optional[str] = None
+    rating: Scalar = None
+    from_location: Optional[str] = None
+    to_location: Optional[str] = None
+    cars: List[Car] = []
+
+
+class Creator(_Payload):
+    language: str = "uz"
+
+
+class Trip(_Payload):
+    id: Optional[int] = None
+    passenger: Scalar = None
+    price: Scalar = None
+
+
+class EndedTrip(_Payload):
+    id: int
+
+
+class _DriverEvent(_Payload):
+    user: int
+    creator: Creator = Creator()
+
+
+class AssignedEvent(_DriverEvent):
+    status: Literal["assigned"]
+    id: Optional[int] = None
+    driver_details: DriverDetails = DriverDetails()
+    content_object: Trip = Trip()
+
+    @property
+    def order_id(self) -> Optional[int]:
+        """None when the backend sent no order id (0 is not a real order)"""
+        return self.id or None
+
+
+class ArrivedEvent(_DriverEvent):
+    status: Literal["arrived"]
+    id: int
+
+    @property
+    def order_id(self) -> int:
+        return self.id
+
+
+class EndedEvent(_DriverEvent):
+    status: Literal["ended"]
+    id: Optional[int] = None
+    content_object: EndedTrip
+
+    @property
+    def order_id(self) -> Optional[int]:
+        return self.id or self.content_object.id or None
+
+
+DriverEvent = Annotated[Union[AssignedEvent, ArrivedEvent, EndedEvent], Field(discriminator="status")]
+
+# Built once; validate_json parses and validates bytes in a single pass
+_driver_event = TypeAdapter(DriverEvent)
+
+
+def _handle_invalid(e: ValidationError) -> Optional[DriverEvent]:
+    if any(err["type"] == "union_tag_invalid" for err in e.errors()):
+        return None
+    raise ValueError(str(e)) from None
+
+
+def decode_driver_event(body: bytes) -> Optional[DriverEvent]:
+    """
+    Decode a /passenger body
+
+    Returns:
+        The typed event, or None for statuses we don't notify about
+
+    Raises:
+        ValueError: malformed JSON or a required field is missing/mistyped
+    """
+    try:
+        return _driver_event.validate_json(body)
+    except ValidationError as e:
+        return _handle_invalid(e)
+
+
+def validate_driver_event(data: Any) -> Optional[DriverEvent]:
+    """Same as decode_driver_event() for an already parsed item (batch bodies)"""
+    try:
+        return _driver_event.validate_python(data)
+    except ValidationError as e:
+        return _handle_invalid(e)
@@ -1,6 +1,7 @@
 # application/bot_app/handler/decorator.py
 
 from typing import Any, Optional, Union, Callable, List, Dict
+import itertools
 from functools import wraps, lru_cache
 
 from telebot.states.asyncio import StateContext
@@ -10,6 +11,9 @@ from telebot.handler_backends import State, StatesGroup
 from application.core.bot import bot
 from application.core.i18n import t
 from application.core.log import logger
+from application.database.throttle import Throttle
+from application.dispatch.ack import acker
+from application.dispatch.scheduler import send_scheduler
 from application.services.city_service import CityServiceAPI
 from application.services.passenger_service import PassengerServiceAPI, PassengerGetService
 from application.services.user_service import TelegramUser, UserService
@@ -42,22 +46,21 @@ def async_lru_cache(maxsize: int = 128):
     return decorator
 
 
+_throttle_ids = itertools.count()
+
+
 def throttle(seconds: int = 1):
-    """Rate limiting decorator"""
-    last_called = {}
+    """Rate limiting decorator (shared across workers with SHARED_STATE)"""
 
     def decorator(func):
+        # Handlers built in a loop share a qualname; registration order is
+        # the same in every worker, so the sequence number keeps keys aligned
+        gate = Throttle(f"{func.__qualname__}:{next(_throttle_ids)}", seconds)
+
         @wraps(func)
         async def wrapper(msg: Union[Message, CallbackQuery], *args, **kwargs):
-            user_id = msg.from_user.id
-            current_time = __import__('time').time()
-
-            if user_id in last_called:
-                elapsed = current_time - last_called[user_id]
-                if elapsed < seconds:
-                    return None
-
-            last_called[user_id] = current_time
+            if not await gate.allow(msg.from_user.id):
+                return None
             return await func(msg, *args, **kwargs)
 
         return wrapper
@@ -145,7 +148,8 @@ class UltraHandler:
     ) -> Optional[Message]:
         final_text = await self._(text, **kwargs) if translate else text
         try:
-            return await bot.send_message(
+            return await send_scheduler.call(
+                self.chat_id, bot.send_message,
                 self.chat_id,
                 final_text,
                 reply_markup=reply_markup,
@@ -153,7 +157,8 @@ class UltraHandler:
             )
         except Exception as e:
             print(e)
-            return  await bot.send_message(
+            return await send_scheduler.call(
+                self.chat_id, bot.send_message,
                 self.chat_id,
                 final_text,
                 reply_markup=reply_markup,
@@ -168,7 +173,8 @@ class UltraHandler:
             **kwargs
     ) -> Optional[Message]:
         final_text = await self._(text, **kwargs) if translate else text
-        return await bot.reply_to(
+        return await send_scheduler.call(
+            self.chat_id, bot.reply_to,
             self.msg,
             final_text,
             reply_markup=reply_markup
@@ -185,7 +191,8 @@ class UltraHandler:
         final_text = await self._(text, **kwargs) if translate else text
         message_id = self._get_message_id()
         try:
-            return await bot.edit_message_text(
+            return await send_scheduler.call(
+                self.chat_id, bot.edit_message_text,
                 final_text,
                 self.chat_id,
                 message_id,
@@ -194,7 +201,8 @@ class UltraHandler:
             )
         except Exception as e:
             print(e)
-            return await bot.edit_message_text(
+            return await send_scheduler.call(
+                self.chat_id, bot.edit_message_text,
                 final_text,
                 self.chat_id,
                 message_id,
@@ -215,12 +223,23 @@ class UltraHandler:
         if not isinstance(self.msg, CallbackQuery):
             return False
 
-        final_text = await self._(text) if (text and translate) else text
-        return await bot.answer_callback_query(
-            self.msg.id,
-            text=final_text,
-            show_alert=show_alert
-        )
+        if not acker.claim(self.msg.id):
+            # Already auto-acknowledged after the ack budget ran out
+            acker.late(self.msg.id, text)
+            return False
+
+        ok = False
+        try:
+            final_text = await self._(text) if (text and translate) else text
+            result = await bot.answer_callback_query(
+                self.msg.id,
+                text=final_text,
+                show_alert=show_alert
+            )
+            ok = True
+        finally:
+            acker.acked(self.msg.id, ok)
+        return result
 
     def _get_message_id(self) -> int:
         return (self.msg.message_id if isinstance(self.msg, Message)
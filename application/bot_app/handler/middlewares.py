@@ -1,11 +1,13 @@
 # Qisqartirilgan versiya - hammasini bitta classda
 import time
-from typing import Dict, Any, Union
+from typing import Any, Union
 
 from telebot.asyncio_handler_backends import BaseMiddleware, CancelUpdate
 from telebot.types import Message, CallbackQuery
 from application.core import bot, logger
 from application.services import TelegramUser
+from application.database.throttle import Throttle
+from application.dispatch.scheduler import send_scheduler
 
 
 class AllInOneMiddleware(BaseMiddleware):
@@ -16,7 +18,7 @@ class AllInOneMiddleware(BaseMiddleware):
         super().__init__()
         self.rate_limit = rate_limit
         self.admin_ids = admin_ids or []
-        self.last_requests: Dict[int, float] = {}
+        self.last_requests = Throttle("middleware", rate_limit)
         self.update_types = ['message', 'callback_query']
 
     async def pre_process(self, message: Message, data: Any):
@@ -62,18 +64,13 @@ class AllInOneMiddleware(BaseMiddleware):
         logger.info(f"{msg_type} from @{username} ({user_id}): {text[:50]}")
 
     async def _check_rate_limit(self, message: Message) -> bool:
-        user_id = message.from_user.id
-        current_time = time.time()
-
-        if user_id in self.last_requests:
-            if current_time - self.last_requests[user_id] < self.rate_limit:
-                try:
-                    await bot.send_message(message.chat.id, "🚫 Too fast! Please wait.")
-                except:
-                    pass
-                return False
+        if not await self.last_requests.allow(message.from_user.id):
+            try:
+                await send_scheduler.call(message.chat.id, bot.send_message, message.chat.id, "🚫 Too fast! Please wait.")
+            except:
+                pass
+            return False
 
-        self.last_requests[user_id] = current_time
         return True
 
     async def _check_admin_commands(self, message: Message) -> bool:
@@ -84,7 +81,7 @@ class AllInOneMiddleware(BaseMiddleware):
         command = message.text.split()[0].lower()
 
         if command in admin_commands and message.from_user.id not in self.admin_ids:
-            await bot.send_message(message.chat.id, "❌ Admin only command.")
+            await send_scheduler.call(message.chat.id, bot.send_message, message.chat.id, "❌ Admin only command.")
             return False
 
         return True
@@ -95,7 +92,7 @@ class AllInOneMiddleware(BaseMiddleware):
 
             # Ban check
             if await TelegramUser().is_ban_user(user_id):
-                await bot.send_message(message.chat.id, "🚫 You are banned.")
+                await send_scheduler.call(message.chat.id, bot.send_message, message.chat.id, "🚫 You are banned.")
                 return False
 
             return True
@@ -1,6 +1,8 @@
 from typing import Dict, Any, List
 from aiohttp import ClientSession
 
+from application.core import codec
+
 USER_AGENT = "RideNowBot/1.0 (admin@ridenow.uz)"
 NOMINATIM_REVERSE = "https://nominatim.openstreetmap.org/reverse"
 NOMINATIM_SEARCH = "https://nominatim.openstreetmap.org/search"
@@ -60,7 +62,7 @@ async def aget_place_from_coords(lat: float, lon: float) -> Dict[str, Any]:
     try:
         async with ClientSession() as session:
             async with session.get(NOMINATIM_REVERSE, params=params, headers=headers, timeout=10) as resp:
-                data = await resp.json()
+                data = codec.loads(await resp.read())
                 result = parse_address(data)
                 # Koordinatalarni qo'shamiz
                 result.update({
@@ -110,7 +112,7 @@ async def aget_coords_from_place(place_name: str, accept_language: str = "uz", l
     try:
         async with ClientSession() as session:
             async with session.get(NOMINATIM_SEARCH, params=params, headers=headers, timeout=10) as resp:
-                data = await resp.json()
+                data = codec.loads(await resp.read())
 
                 results = []
                 for item in data:
@@ -1,21 +1,26 @@
 """
 Main FastAPI application
 """
+import asyncio
+
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
 from application.core.config import settings
 from application.core.log import logger
 from application.database.cache import cache
-from application.core.i18n import init_translations
+from application.core.i18n import init_translations, watch_translations
 from application.api.routes import router
+from application.api.capture import recorder
 from application.services.http_client import GlobalHTTPClient
+from application.dispatch import update_queue, admission, journal, delivery_queue
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
 
     logger.info("🚀 Starting application...")
+    i18n_watcher = None
 
     try:
         # Connect to Redis
@@ -25,12 +30,29 @@ async def lifespan(app: FastAPI):
         # Initialize translations
         await init_translations(cache.client)
         logger.info("✅ Translations initialized")
+        if settings.use_shared_state:
+            i18n_watcher = asyncio.create_task(watch_translations(cache.client), name="i18n-watcher")
 
         # Setup bot handlers
         from application.bot_app.handler import setup_handlers
         await setup_handlers()
         logger.info("✅ Bot handlers setup complete")
 
+        # Start update workers
+        await update_queue.start()
+        await admission.start()
+        if settings.UPDATE_JOURNAL_ENABLED:
+            await journal.start(update_queue)
+        logger.info("✅ Update queue started")
+
+        await delivery_queue.start()
+
+        # Open backend connections now rather than on the first user request
+        await GlobalHTTPClient().warm_up(settings.MAIN_URL, settings.BACKEND_WARM_CONNECTIONS)
+
+        if settings.CAPTURE_ENABLED:
+            await recorder.start()
+
         logger.info("✅ Application started successfully")
 
         yield
@@ -43,6 +65,28 @@ async def lifespan(app: FastAPI):
         # Shutdown
         logger.info("🛑 Shutting down application...")
 
+        if i18n_watcher is not None:
+            i18n_watcher.cancel()
+
+        await recorder.stop()
+
+        try:
+            # Drain pending updates before closing clients
+            if settings.UPDATE_JOURNAL_ENABLED:
+                await journal.stop()
+            await admission.stop()
+            await update_queue.stop()
+            if settings.UPDATE_JOURNAL_ENABLED:
+                await journal.flush_acks()
+        except Exception as e:
+            logger.error(f"❌ Error stopping update queue: {e}")
+
+        try:
+            # Flush accepted notifications while the Bot API session is still open
+            await delivery_queue.stop()
+        except Exception as e:
+            logger.error(f"❌ Error stopping delivery queue: {e}")
+
         try:
             # Close HTTP client sessions
             await GlobalHTTPClient().close()
@@ -1,14 +1,20 @@
 # application/core/bot.py
-from telebot import asyncio_filters
+from telebot import asyncio_filters, asyncio_helper
 from telebot.async_telebot import AsyncTeleBot
-from telebot.asyncio_storage import StateMemoryStorage
+from telebot.asyncio_storage import StateMemoryStorage, StateRedisStorage
 from application.core.config import settings
 from application.core.log import logger
 from telebot.states.asyncio.middleware import StateMiddleware
 
 
-# State storage for TeleBot
-state_storage = StateMemoryStorage()
+# Bot API endpoint (overridable for a local Bot API server or a test stub)
+asyncio_helper.API_URL = f"{settings.BOT_API_URL.rstrip('/')}/bot{{0}}/{{1}}"
+
+# State storage for TeleBot (Redis when several worker processes share users)
+if settings.use_shared_state:
+    state_storage = StateRedisStorage(redis_url=settings.REDIS_URL, prefix="telebot")
+else:
+    state_storage = StateMemoryStorage()
 
 # Create bot instance
 bot = AsyncTeleBot(
@@ -0,0 +1,113 @@
+# application/core/codec.py
+"""
+Pluggable JSON codec: bytes in, bytes out.
+
+``loads``/``dumps`` use the active codec, picked by ``settings.JSON_CODEC``
+("auto" prefers orjson, then msgspec, then the stdlib). Other backends can
+be added with ``register()`` and selected with ``use()``.
+"""
+
+import json
+from typing import Any, Callable, Dict, Optional, Union
+
+from .config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional speedup
+    msgspec = None
+
+Bytes = Union[bytes, bytearray, memoryview, str]
+
+
+class Codec:
+    """
+    A named pair of functions.
+
+    ``dumps`` must return UTF-8 bytes and ``loads`` must accept bytes (and
+    str) and raise ValueError on malformed input.
+    """
+
+    __slots__ = ("name", "dumps", "loads")
+
+    def __init__(self, name: str, dumps: Callable[[Any], bytes], loads: Callable[[Bytes], Any]):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self) -> str:
+        return f"Codec({self.name!r})"
+
+
+def _std_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _std_loads(data: Bytes) -> Any:
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    return json.loads(data)
+
+
+_codecs: Dict[str, Codec] = {"json": Codec("json", _std_dumps, _std_loads)}
+
+if orjson is not None:
+    def _orjson_dumps(obj: Any) -> bytes:
+        # Non-str keys are stringified like the stdlib does
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    _codecs["orjson"] = Codec("orjson", _orjson_dumps, orjson.loads)
+
+if msgspec is not None:
+    _msgspec_decoder = msgspec.json.Decoder()
+
+    def _msgspec_loads(data: Bytes) -> Any:
+        try:
+            return _msgspec_decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from None
+
+    _codecs["msgspec"] = Codec("msgspec", msgspec.json.Encoder().encode, _msgspec_loads)
+
+
+def register(codec: Codec) -> None:
+    _codecs[codec.name] = codec
+
+
+def available() -> Dict[str, Codec]:
+    return dict(_codecs)
+
+
+def get_codec(name: str) -> Codec:
+    if name == "auto":
+        for preferred in ("orjson", "msgspec", "json"):
+            if preferred in _codecs:
+                return _codecs[preferred]
+    try:
+        return _codecs[name]
+    except KeyError:
+        raise ValueError(f"Unknown JSON codec {name!r}; available: {', '.join(_codecs)}") from None
+
+
+# Bound to the active codec's functions by use(), so a call costs nothing
+# extra; always call them as codec.loads / codec.dumps, never import them
+current: Optional[Codec] = None
+loads: Callable[[Bytes], Any]  # parse raw bytes; ValueError on malformed input
+dumps: Callable[[Any], bytes]  # serialise to UTF-8 JSON bytes
+
+
+def use(name: str) -> Codec:
+    """Switch the active codec for every codec.loads()/codec.dumps() caller"""
+    global current, loads, dumps
+    current = get_codec(name)
+    loads = current.loads
+    dumps = current.dumps
+    return current
+
+
+use(settings.JSON_CODEC)
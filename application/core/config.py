@@ -22,9 +22,15 @@ class Settings(BaseSettings):
     # Webhook
     WEBHOOK_URL_DEMO: str = "28493463f9a9.ngrok-free.app"
 
+    # Bot API / long polling
+    BOT_API_URL: str = "https://api.telegram.org"
+    POLLING_TIMEOUT: int = 25  # getUpdates long-poll seconds
+    POLLING_LIMIT: int = 100
+
     # API settings
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
+    JSON_CODEC: str = "auto"  # "auto", "orjson", "msgspec" or "json"
 
     # Localization
     LOCALES_PATH: str = "./locales"
@@ -34,10 +40,97 @@ class Settings(BaseSettings):
 
     # Admin
     ADMIN_IDS: str = ""
+    ADMIN_API_TOKEN: str = ""  # X-Admin-Token for /admin endpoints; empty = disabled
 
     # Redis
     REDIS_MAX_CONNECTIONS: int = 10
 
+    # Processes; with more than one, bot state and rate limits live in Redis
+    WORKERS: int = 1
+    SHARED_STATE: bool = False
+
+    # Update dispatch
+    UPDATE_EXECUTOR: str = "sharded"  # "sharded" (per-chat order) or "pool"
+    UPDATE_QUEUE_SIZE: int = 1000
+    UPDATE_WORKERS: int = 8
+    UPDATE_LANES: int = 16
+    UPDATE_LANE_BACKLOG: int = 100
+    UPDATE_CALLBACK_PRIORITY: bool = True  # callback queries jump ahead within their own lane
+    CALLBACK_AUTO_ACK: bool = True
+    CALLBACK_ACK_BUDGET: float = 0.3  # seconds for a handler to answer before auto-ack
+    UPDATE_DEDUP_ENABLED: bool = True
+    UPDATE_DEDUP_WINDOW: int = 10000  # local ring size
+    UPDATE_DEDUP_TTL: int = 3600  # seconds
+    UPDATE_DEDUP_LEASE: int = 60  # seconds an unfinished update blocks others; keep <= journal claim idle
+
+    # Durable journal (Redis Streams); off = in-memory queue only
+    UPDATE_JOURNAL_ENABLED: bool = False
+    UPDATE_JOURNAL_STREAM: str = "updates:journal"
+    UPDATE_JOURNAL_GROUP: str = "passenger-bot"
+    UPDATE_JOURNAL_MAXLEN: int = 100000
+    UPDATE_JOURNAL_CLAIM_IDLE_MS: int = 60000
+
+    # Load shedding (in-flight updates: queued + running)
+    ADMISSION_HIGH_WATERMARK: int = 800
+    ADMISSION_LOW_WATERMARK: int = 400
+    ADMISSION_DEFER_LIMIT: int = 1000
+    ADMISSION_REPEAT_WINDOW: float = 2.0  # seconds between identical callback taps
+
+    # Outbound Bot API pacing (Telegram flood limits)
+    SEND_GLOBAL_RATE: float = 30.0  # messages/s for the whole bot
+    SEND_GLOBAL_BURST: int = 30
+    SEND_CHAT_RATE: float = 1.0  # messages/s per private chat
+    SEND_CHAT_BURST: int = 3
+    SEND_GROUP_RATE_PER_MIN: float = 20.0
+    SEND_GROUP_BURST: int = 3
+
+    # Outbound delivery of backend driver events (/passenger)
+    DELIVERY_QUEUE_SIZE: int = 1000  # split evenly across senders
+    DELIVERY_SENDERS: int = 4  # an order (or chat) always uses the same sender
+    DELIVERY_MAX_ATTEMPTS: int = 5
+    DELIVERY_BACKOFF_BASE: float = 0.5  # seconds, doubled per attempt
+    DELIVERY_BACKOFF_MAX: float = 30.0
+    DELIVERY_COALESCE_WINDOW: float = 30.0  # edit the arrived message on "ended" within this; 0 = off
+    ORDER_STATE_TTL: int = 86400  # seconds an order's last status is remembered
+    DRIVER_BATCH_MAX: int = 500  # events per /passenger/batch request
+    DEAD_LETTER_KEY: str = "deliveries:dead"
+    DEAD_LETTER_MAX: int = 10000  # oldest entries are trimmed beyond this
+
+    # Backend API client (BaseService)
+    BACKEND_POOL_SIZE: int = 100  # connections in total
+    BACKEND_POOL_PER_HOST: int = 20
+    BACKEND_KEEPALIVE_TIMEOUT: float = 30.0  # seconds an idle connection is kept
+    BACKEND_DNS_TTL: int = 300  # seconds resolved addresses are cached
+    BACKEND_TIMEOUT: float = 30.0  # total seconds per request
+    BACKEND_WARM_CONNECTIONS: int = 4  # opened to MAIN_URL at startup; 0 = lazy
+    BACKEND_RETRY_ATTEMPTS: int = 3  # including the first try; 1 = no retries
+    BACKEND_RETRY_BASE: float = 0.2  # seconds, full jitter over base * 2**n
+    BACKEND_RETRY_MAX: float = 5.0  # cap on one backoff, and on an honoured Retry-After
+    BACKEND_RETRY_BUDGET: float = 0.1  # retries as a share of requests (10 s window)
+    BACKEND_RETRY_MIN: int = 10  # retries always allowed per window
+    BACKEND_BREAKER_ENABLED: bool = True
+    BACKEND_BREAKER_WINDOW: float = 30.0  # seconds of outcomes per endpoint
+    BACKEND_BREAKER_MIN_CALLS: int = 10  # before the failure rate is judged
+    BACKEND_BREAKER_FAILURE_RATE: float = 0.5
+    BACKEND_BREAKER_OPEN_SECONDS: float = 15.0  # fail fast this long before probing
+    BACKEND_BREAKER_PROBES: int = 3  # half-open trial calls
+    BACKEND_SINGLE_FLIGHT: bool = True  # share one upstream call between identical concurrent GETs
+    BACKEND_CACHE_SIZE: int = 1000  # responses kept in process (LRU)
+    BACKEND_CACHE_REDIS: bool = False  # share cached responses between workers
+    BACKEND_CACHE_STALE_TTL: int = 86400  # seconds expired entries are kept for revalidation
+    BACKEND_HEDGE_ENABLED: bool = True  # for endpoints a service lists in hedged_endpoints
+    BACKEND_HEDGE_PERCENTILE: float = 0.95  # hedge once the first try is slower than this
+    BACKEND_HEDGE_MIN_DELAY: float = 0.02  # seconds
+    BACKEND_HEDGE_WINDOW: int = 200  # recent latencies per endpoint
+    BACKEND_HEDGE_MIN_SAMPLES: int = 20  # no hedging before this much history
+    BACKEND_HEDGE_BUDGET: float = 0.05  # hedges as a share of hedgeable requests (10 s window)
+
+    # Traffic capture for replay benchmarks (personal fields are scrubbed)
+    CAPTURE_ENABLED: bool = False
+    CAPTURE_DIR: str = "./captures"
+    CAPTURE_ROTATE_BYTES: int = 64 * 1024 * 1024  # uncompressed bytes per file
+    CAPTURE_ROTATE_SECONDS: int = 3600
+
     @property
     def BOT_TOKEN(self) -> str:
         """Get bot token based on DEBUG mode"""
@@ -75,6 +168,11 @@ class Settings(BaseSettings):
         """Get port based on DEBUG mode"""
         return self.PORT_DEMO
 
+    @property
+    def use_shared_state(self) -> bool:
+        """Keep FSM state, throttles and i18n in Redis (forced with several workers)"""
+        return self.SHARED_STATE or self.WORKERS > 1
+
     @property
     def MAIN_URL(self) -> str:
         """Get main url based on DEBUG mode"""
@@ -1,6 +1,7 @@
 # application/core/i18n.py
 
 import json
+import os
 from pathlib import Path
 from typing import Dict, Optional
 import redis.asyncio as redis
@@ -13,6 +14,9 @@ _translations: Dict[str, Dict[str, str]] = {}
 # Reverse lookup cache for slug detection
 _reverse_lookup: Dict[str, Dict[str, str]] = {}
 
+# Pub/sub channel used to keep worker processes in sync
+I18N_RELOAD_CHANNEL = "i18n:reload"
+
 
 async def init_translations(redis_client: redis.Redis) -> None:
     """
@@ -88,6 +92,47 @@ async def init_translations(redis_client: redis.Redis) -> None:
         raise
 
 
+async def load_translations_from_redis(redis_client: redis.Redis) -> int:
+    """
+    Replace the in-memory translations with the copy stored in Redis
+
+    Returns:
+        Number of languages loaded
+    """
+    loaded = 0
+    for lang in settings.SUPPORTED_LANGS:
+        flat_data = await redis_client.hgetall(f"i18n:{lang}")
+        if not flat_data:
+            continue
+        _translations[lang] = flat_data
+        _reverse_lookup[lang] = {v: k for k, v in flat_data.items()}
+        loaded += 1
+    return loaded
+
+
+async def reload_translations(redis_client: redis.Redis) -> None:
+    """Re-read the JSON files and tell every worker process to pick them up"""
+    await init_translations(redis_client)
+    await redis_client.publish(I18N_RELOAD_CHANNEL, str(os.getpid()))
+
+
+async def watch_translations(redis_client: redis.Redis) -> None:
+    """Reload translations from Redis whenever another worker publishes a change"""
+    pubsub = redis_client.pubsub()
+    await pubsub.subscribe(I18N_RELOAD_CHANNEL)
+    try:
+        async for message in pubsub.listen():
+            if message["type"] != "message" or message["data"] == str(os.getpid()):
+                continue
+            try:
+                count = await load_translations_from_redis(redis_client)
+                logger.info(f"🔄 Translations reloaded from Redis ({count} languages)")
+            except Exception as e:
+                logger.error(f"❌ Translation reload failed: {e}")
+    finally:
+        await pubsub.aclose()
+
+
 def detect_slug(text: str, lang: Optional[str] = None, threshold: float = 0.8) -> Optional[str]:
     """
     Detect translation slug from text using fuzzy matching
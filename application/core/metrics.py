@@ -0,0 +1,226 @@
+# application/core/metrics.py
+"""
+Lightweight in-process metrics registry (Prometheus text format)
+"""
+
+import bisect
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key)
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{v}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+class _Metric:
+    """Base metric with labelled values"""
+    kind = "untyped"
+
+    def __init__(self, name: str, doc: str = ""):
+        self.name = name
+        self.doc = doc
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+    def snapshot(self) -> Dict[str, object]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+    kind = "counter"
+
+    def __init__(self, name: str, doc: str = ""):
+        super().__init__(name, doc)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def total(self) -> float:
+        return sum(self._values.values())
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(k)} {v}" for k, v in self._values.items()]
+
+    def snapshot(self) -> Dict[str, object]:
+        return {_format_labels(k) or "_": v for k, v in self._values.items()}
+
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down, optionally computed on scrape.
+
+    ``fn`` may return a number, or a dict like ``{"lane=0": 3.0}`` for
+    labelled values.
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, doc: str = "", fn: Optional[Callable[[], object]] = None):
+        super().__init__(name, doc)
+        self._values: Dict[LabelKey, float] = {}
+        self._fn = fn
+
+    def set(self, value: float, **labels) -> None:
+        self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return dict(self._items()).get(_label_key(labels), 0.0)
+
+    def _items(self) -> List[Tuple[LabelKey, float]]:
+        if self._fn is None:
+            return list(self._values.items())
+        value = self._fn()
+        if isinstance(value, dict):
+            # {label_value: number} for single-label gauges, e.g. {"lane=0": 3}
+            return [(tuple(tuple(p.split("=", 1)) for p in k.split(",")), float(v)) for k, v in value.items()]
+        return [((), float(value))]
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(k)} {v}" for k, v in self._items()]
+
+    def snapshot(self) -> Dict[str, object]:
+        return {_format_labels(k) or "_": v for k, v in self._items()}
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observed values"""
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, doc)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelKey, List[int]] = {}
+        self._sums: Dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[idx] += 1
+            self._sums[key] += value
+
+    def count(self, **labels) -> int:
+        return sum(self._counts.get(_label_key(labels), ()))
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Approximate quantile (upper bucket bound)"""
+        counts = self._counts.get(_label_key(labels))
+        if not counts:
+            return None
+        target = q * sum(counts)
+        running = 0
+        for i, c in enumerate(counts):
+            running += c
+            if running >= target:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return None
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, counts in self._counts.items():
+            running = 0
+            for bound, c in zip(self.buckets, counts):
+                running += c
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', str(bound)))} {running}")
+            running += counts[-1]
+            lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {running}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {self._sums[key]}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {running}")
+        return lines
+
+    def snapshot(self) -> Dict[str, object]:
+        result = {}
+        for key, counts in self._counts.items():
+            total = sum(counts)
+            result[_format_labels(key) or "_"] = {
+                "count": total,
+                "sum": round(self._sums[key], 6),
+                "p50": self.quantile(0.5, **dict(key)),
+                "p95": self.quantile(0.95, **dict(key)),
+                "p99": self.quantile(0.99, **dict(key)),
+            }
+        return result
+
+
+class MetricsRegistry:
+    """Registry of named metrics; get-or-create semantics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, *args, **kwargs)
+        return metric
+
+    def counter(self, name: str, doc: str = "") -> Counter:
+        return self._get_or_create(Counter, name, doc)
+
+    def gauge(self, name: str, doc: str = "", fn: Optional[Callable[[], object]] = None) -> Gauge:
+        gauge = self._get_or_create(Gauge, name, doc)
+        if fn is not None:
+            gauge._fn = fn
+        return gauge
+
+    def histogram(self, name: str, doc: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, doc, buckets)
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self, prefix: str = "") -> Dict[str, object]:
+        """JSON-friendly view of metrics, optionally filtered by name prefix"""
+        return {
+            name: metric.snapshot()
+            for name, metric in self._metrics.items()
+            if name.startswith(prefix)
+        }
+
+
+# Singleton instance
+metrics = MetricsRegistry()
@@ -0,0 +1,121 @@
+# application/database/order_state.py
+
+from enum import Enum
+from typing import Optional, Tuple
+
+from application.core.config import settings
+from application.core.log import logger
+from application.core.metrics import metrics
+from application.database.cache import cache
+
+# Statuses in the only order an order can move through them
+ORDER_STATUSES = ("assigned", "arrived", "ended")
+_RANK = {status: rank for rank, status in enumerate(ORDER_STATUSES, start=1)}
+
+
+def status_rank(status: str) -> int:
+    """Position of status in ORDER_STATUSES (1-based); 0 for anything else"""
+    return _RANK.get(status, 0)
+
+# KEYS[1] order key; ARGV[1] new rank, ARGV[2] ttl.
+# Returns {verdict, previous rank}: 1 advanced, 0 duplicate, -1 regression
+_ADVANCE = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local new = tonumber(ARGV[1])
+if new == current then return {0, current} end
+if new < current then return {-1, current} end
+redis.call('SET', KEYS[1], new, 'EX', ARGV[2])
+return {1, current}
+"""
+
+# Undo an advance only if nothing moved the order since
+_ROLLBACK = """
+if tonumber(redis.call('GET', KEYS[1]) or '0') ~= tonumber(ARGV[1]) then return 0 end
+if tonumber(ARGV[2]) == 0 then redis.call('DEL', KEYS[1])
+else redis.call('SET', KEYS[1], ARGV[2], 'KEEPTTL') end
+return 1
+"""
+
+
+class Transition(str, Enum):
+    ADVANCED = "advanced"
+    DUPLICATE = "duplicate"
+    REGRESSION = "regression"
+
+
+class OrderStateMachine:
+    """
+    Per-order status (assigned -> arrived -> ended) kept in Redis with a TTL.
+
+    Each event is applied with one atomic Lua compare-and-set: moving
+    forward (skipping a lost step is allowed) is accepted, a repeat of the
+    current status is a duplicate and an older status is a regression.
+    If Redis is unavailable events are let through.
+    """
+
+    KEY_PREFIX = "order:status:"
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._client = None
+        self._advance = None
+        self._rollback = None
+        self._events = metrics.counter("driver_events_total", "Driver events by state machine outcome")
+
+    def _scripts(self):
+        # Scripts are bound to a client; re-register after a reconnect
+        if self._client is not cache.client:
+            self._client = cache.client
+            self._advance = self._client.register_script(_ADVANCE)
+            self._rollback = self._client.register_script(_ROLLBACK)
+        return self._advance, self._rollback
+
+    async def advance(self, order_id: int, status: str) -> Tuple[Transition, int]:
+        """Apply status to the order; returns the outcome and the previous rank"""
+        try:
+            advance, _ = self._scripts()
+            verdict, previous = await advance(keys=[f"{self.KEY_PREFIX}{order_id}"], args=[_RANK[status], self.ttl])
+        except Exception as e:
+            logger.warning(f"⚠️ Order state unavailable, passing {status} for order {order_id}: {e}")
+            self._events.inc(result="unchecked", status=status)
+            return Transition.ADVANCED, 0
+
+        result = {1: Transition.ADVANCED, 0: Transition.DUPLICATE, -1: Transition.REGRESSION}[int(verdict)]
+        self._events.inc(result=result.value, status=status)
+        return result, int(previous)
+
+    async def rollback(self, order_id: int, status: str, previous: int) -> None:
+        """Revert an advance whose notification could not be accepted"""
+        try:
+            _, rollback = self._scripts()
+            await rollback(keys=[f"{self.KEY_PREFIX}{order_id}"], args=[_RANK[status], previous])
+        except Exception as e:
+            logger.warning(f"⚠️ Order state rollback failed for order {order_id}: {e}")
+
+    async def current(self, order_id: int) -> Optional[str]:
+        rank = await cache.client.get(f"{self.KEY_PREFIX}{order_id}")
+        return ORDER_STATUSES[int(rank) - 1] if rank else None
+
+    async def current_rank(self, order_id: int) -> int:
+        """Rank of the order's status; 0 if unknown or Redis is unavailable"""
+        try:
+            rank = await cache.client.get(f"{self.KEY_PREFIX}{order_id}")
+        except Exception as e:
+            logger.warning(f"⚠️ Order state unavailable for order {order_id}: {e}")
+            return 0
+        return int(rank) if rank else 0
+
+    def _count(self, result: Transition) -> float:
+        return sum(self._events.value(result=result.value, status=status) for status in ORDER_STATUSES)
+
+    def stats(self):
+        return {
+            "ttl": self.ttl,
+            "advanced": self._count(Transition.ADVANCED),
+            "duplicate": self._count(Transition.DUPLICATE),
+            "regression": self._count(Transition.REGRESSION),
+        }
+
+
+# Singleton instance
+order_states = OrderStateMachine(ttl=settings.ORDER_STATE_TTL)
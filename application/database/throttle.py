@@ -0,0 +1,51 @@
+# application/database/throttle.py
+
+import time
+from typing import Dict, Hashable
+
+from application.core.config import settings
+from application.core.log import logger
+from application.database.cache import cache
+
+
+class Throttle:
+    """
+    "At most once per interval" gate per key.
+
+    Process-local by default; with SHARED_STATE the gate is a Redis
+    ``SET NX PX`` marker so every worker process sees the same limit.
+    If Redis fails the request is let through.
+    """
+
+    def __init__(self, name: str, interval: float):
+        self.name = name
+        self.interval = interval
+        self._last: Dict[Hashable, float] = {}
+
+    async def allow(self, key: Hashable) -> bool:
+        """Record a hit for key; False if the previous one was less than interval ago"""
+        if self.interval <= 0:
+            return True
+        if settings.use_shared_state:
+            return await self._allow_shared(key)
+        return self._allow_local(key)
+
+    def _allow_local(self, key: Hashable) -> bool:
+        now = time.monotonic()
+        last = self._last.get(key)
+        if last is not None and now - last < self.interval:
+            return False
+        self._last[key] = now
+        if len(self._last) > 50000:
+            # Forget keys that can no longer block anything
+            self._last = {k: v for k, v in self._last.items() if now - v < self.interval}
+        return True
+
+    async def _allow_shared(self, key: Hashable) -> bool:
+        try:
+            return bool(await cache.client.set(
+                f"throttle:{self.name}:{key}", 1, nx=True, px=max(1, int(self.interval * 1000))
+            ))
+        except Exception as e:
+            logger.warning(f"⚠️ Shared throttle '{self.name}' unavailable: {e}")
+            return True
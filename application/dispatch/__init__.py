@@ -0,0 +1,28 @@
+"""
+Update dispatch: ingestion queue and workers between the webhook and the bot,
+plus the outbound delivery queue (and its dead-letter list) for backend
+notifications
+"""
+
+from .ack import CallbackAcker, acker
+from .admission import AdmissionController, Decision
+from .decode import LazyUpdate, decode_update
+from .delivery import Delivery, DeliveryQueue, delivery_queue
+from .dead_letter import DeadLetterStore, dead_letters
+from .scheduler import SendScheduler, TokenBucket, send_scheduler
+from .dedup import UpdateDeduplicator, deduplicator
+from .queue import UpdateQueue
+from .journal import UpdateJournal, journal
+from .executor import ShardedExecutor, update_chat_id, update_queue, admission
+
+__all__ = [
+    'LazyUpdate', 'decode_update',
+    'UpdateDeduplicator', 'deduplicator',
+    'UpdateQueue', 'ShardedExecutor', 'update_chat_id', 'update_queue',
+    'AdmissionController', 'Decision', 'admission',
+    'UpdateJournal', 'journal',
+    'CallbackAcker', 'acker',
+    'Delivery', 'DeliveryQueue', 'delivery_queue',
+    'DeadLetterStore', 'dead_letters',
+    'SendScheduler', 'TokenBucket', 'send_scheduler',
+]
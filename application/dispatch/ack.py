@@ -0,0 +1,126 @@
+# application/dispatch/ack.py
+"""
+Automatic answer_callback_query within a latency budget
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+from application.core.bot import bot
+from application.core.config import settings
+from application.core.log import logger
+from application.core.metrics import metrics
+from .dedup import RecentIds
+
+# Time-to-ack is dominated by the Bot API round trip
+_ACK_BUCKETS = (0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0, 10.0, 15.0)
+
+
+class CallbackAcker:
+    """
+    Makes sure every callback query is answered, so Telegram stops showing
+    the button spinner.
+
+    The registered handler gets ``budget`` seconds (counted from when the
+    update was received) to answer itself via ``UltraHandler.answer``;
+    otherwise an empty answer is sent automatically. Once the handler
+    finishes, any still unanswered callback is acknowledged at once.
+    """
+
+    def __init__(self, budget: float, enabled: bool = True):
+        self.budget = budget
+        self.enabled = enabled
+        self._pending: Dict[str, Tuple[float, Optional[asyncio.TimerHandle]]] = {}
+        self._claimed: Dict[str, float] = {}
+        self._answered = RecentIds(10000)
+        self._tasks = set()
+
+        self._time_to_ack = metrics.histogram(
+            "callback_time_to_ack_seconds", "Update received to answer_callback_query", buckets=_ACK_BUCKETS
+        )
+        self._acks = metrics.counter("callback_acks_total", "Callback queries answered")
+        self._late = metrics.counter("callback_late_answers_total", "Handler answers sent after the auto-ack")
+        metrics.gauge("callback_unanswered", "Callback queries waiting for an answer", fn=lambda: len(self._pending))
+
+    def watch(self, callback_id: str, received_at: float) -> None:
+        """Start the budget timer for a callback accepted for handling"""
+        if not self.enabled or callback_id in self._pending or callback_id in self._answered:
+            return
+        delay = max(0.0, received_at + self.budget - time.monotonic())
+        timer = asyncio.get_running_loop().call_later(delay, self._auto_ack, callback_id, "budget")
+        self._pending[callback_id] = (received_at, timer)
+
+    def release(self, callback_id: str) -> None:
+        """Handler chain finished: acknowledge now if nobody answered"""
+        if callback_id in self._pending:
+            self._auto_ack(callback_id, "handler_done")
+
+    def claim(self, callback_id: str) -> bool:
+        """
+        Called by a handler before answering explicitly.
+
+        False means the callback has already been answered (by the timer);
+        Telegram rejects a second answer, so the caller should skip it.
+        """
+        if callback_id in self._answered:
+            return False
+        received_at, timer = self._pending.pop(callback_id, (None, None))
+        if timer is not None:
+            timer.cancel()
+        if received_at is not None:
+            self._claimed[callback_id] = received_at
+        self._answered.add(callback_id)
+        return True
+
+    def acked(self, callback_id: str, ok: bool = True) -> None:
+        """Record the explicit answer attempted after claim(); always call it once"""
+        received_at = self._claimed.pop(callback_id, None)
+        if not ok:
+            self._acks.inc(by="handler", result="error")
+            return
+        self._acks.inc(by="handler")
+        if received_at is not None:
+            self._time_to_ack.observe(time.monotonic() - received_at, by="handler")
+
+    def late(self, callback_id: str, text: str) -> None:
+        """A handler answered after the auto-ack; its text never reached the user"""
+        self._late.inc()
+        if text:
+            logger.warning(f"⚠️ Callback {callback_id} was already auto-acknowledged, answer dropped: {text!r}")
+
+    def _auto_ack(self, callback_id: str, reason: str) -> None:
+        received_at, timer = self._pending.pop(callback_id, (None, None))
+        if received_at is None:
+            return
+        if timer is not None:
+            timer.cancel()
+        self._answered.add(callback_id)
+        task = asyncio.create_task(self._answer(callback_id, received_at, reason))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _answer(self, callback_id: str, received_at: float, reason: str) -> None:
+        try:
+            await bot.answer_callback_query(callback_id)
+        except Exception as e:
+            # Usually "query is too old": the update waited longer than Telegram allows
+            self._acks.inc(by="auto", result="error")
+            logger.warning(f"⚠️ Auto-ack failed for callback {callback_id}: {e}")
+            return
+        self._acks.inc(by="auto", reason=reason)
+        self._time_to_ack.observe(time.monotonic() - received_at, by="auto")
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "enabled": self.enabled,
+            "budget": self.budget,
+            "unanswered": len(self._pending),
+            "acks": self._acks.total(),
+            "late_answers": self._late.total(),
+            "time_to_ack_p95": self._time_to_ack.quantile(0.95, by="auto"),
+        }
+
+
+# Singleton instance
+acker = CallbackAcker(budget=settings.CALLBACK_ACK_BUDGET, enabled=settings.CALLBACK_AUTO_ACK)
@@ -0,0 +1,184 @@
+# application/dispatch/admission.py
+"""
+Admission control: shed low-value updates when the executor is overloaded
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from enum import Enum
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from application.core.log import logger
+from application.core.metrics import metrics
+from .decode import update_chat_id
+from .queue import UpdateQueue
+
+# Update kinds that are never worth processing under load
+_EDITED_FIELDS = ("edited_message", "edited_channel_post", "edited_business_message")
+
+
+class Decision(str, Enum):
+    ADMIT = "admit"
+    DEFER = "defer"
+    DROP = "drop"
+
+
+class AdmissionController:
+    """
+    Watermark-based load shedding in front of the update executor.
+
+    Shedding starts when in-flight updates (queued + running) reach the
+    high watermark and stops once they fall to the low watermark. While
+    shedding:
+
+    - callback queries and /commands are admitted;
+    - edited messages and repeated taps on the same button are dropped;
+    - other messages are deferred and re-submitted once load is low
+      (dropped if the defer buffer is full).
+
+    Per-chat order is kept across deferral: while a chat has deferred
+    updates, all its later ones are deferred behind them, and new
+    non-priority traffic waits until the defer buffer has drained.
+    """
+
+    def __init__(
+            self,
+            executor: UpdateQueue,
+            high_watermark: int,
+            low_watermark: int,
+            defer_limit: int,
+            repeat_window: float,
+    ):
+        self.executor = executor
+        self.high_watermark = high_watermark
+        self.low_watermark = min(low_watermark, high_watermark)
+        self.repeat_window = repeat_window
+        self.shedding = False
+        self._deferred: Deque[Dict[str, Any]] = deque(maxlen=defer_limit)
+        self._deferred_chats: Dict[int, int] = {}  # chat_id -> updates in the defer buffer
+        self._taps: "OrderedDict[Tuple[int, str], float]" = OrderedDict()
+        self._drainer: Optional[asyncio.Task] = None
+
+        self._admitted = metrics.counter("updates_admitted_total", "Updates admitted by the admission controller")
+        self._shed = metrics.counter("updates_shed_total", "Updates dropped or deferred by load shedding")
+        metrics.gauge("updates_shedding", "1 while load shedding is active", fn=lambda: int(self.shedding))
+        metrics.gauge("updates_deferred", "Updates waiting in the defer buffer", fn=lambda: len(self._deferred))
+
+    # ==================== LIFECYCLE ====================
+
+    async def start(self) -> None:
+        if self._drainer is None:
+            self._drainer = asyncio.create_task(self._drain_loop(), name="admission-drainer")
+
+    async def stop(self) -> None:
+        if self._drainer is not None:
+            self._drainer.cancel()
+            await asyncio.gather(self._drainer, return_exceptions=True)
+            self._drainer = None
+        if self._deferred:
+            logger.warning(f"⚠️ Admission controller stopped with {len(self._deferred)} deferred updates")
+
+    # ==================== DECISIONS ====================
+
+    def _update_state(self) -> None:
+        load = self.executor.in_flight()
+        if not self.shedding and load >= self.high_watermark:
+            self.shedding = True
+            logger.warning(f"🚧 Load shedding ON (in-flight={load} >= {self.high_watermark})")
+        elif self.shedding and load <= self.low_watermark:
+            self.shedding = False
+            logger.info(f"✅ Load shedding OFF (in-flight={load} <= {self.low_watermark})")
+
+    def _is_repeat_tap(self, callback: Dict[str, Any]) -> bool:
+        key = (callback.get("from", {}).get("id", 0), callback.get("data") or "")
+        now = time.monotonic()
+        last = self._taps.pop(key, None)
+        self._taps[key] = now
+        while len(self._taps) > 10000:
+            self._taps.popitem(last=False)
+        return last is not None and now - last < self.repeat_window
+
+    @staticmethod
+    def _is_command(data: Dict[str, Any]) -> bool:
+        text = (data.get("message") or {}).get("text") or ""
+        return text.startswith("/")
+
+    def admit(self, data: Dict[str, Any]) -> Decision:
+        """Classify an incoming update under the current load"""
+        self._update_state()
+        callback = data.get("callback_query")
+        repeat = self._is_repeat_tap(callback) if callback else False
+
+        if not self.shedding:
+            self._drain()
+        chat_id = update_chat_id(data)
+        if chat_id in self._deferred_chats:
+            # Never let a chat's later update overtake its deferred ones
+            return self._defer(data, chat_id, "chat_deferred")
+
+        priority = bool(callback) or self._is_command(data)
+        if not self.shedding:
+            if self._deferred and not priority:
+                return self._defer(data, chat_id, "backlog")
+            self._admitted.inc(mode="normal")
+            return Decision.ADMIT
+
+        if callback:
+            if repeat:
+                return self._reject(Decision.DROP, "repeat_tap")
+            self._admitted.inc(mode="priority")
+            return Decision.ADMIT
+
+        if priority:
+            self._admitted.inc(mode="priority")
+            return Decision.ADMIT
+
+        if any(field in data for field in _EDITED_FIELDS):
+            return self._reject(Decision.DROP, "edited")
+
+        return self._defer(data, chat_id, "low_priority")
+
+    def _defer(self, data: Dict[str, Any], chat_id: Optional[int], reason: str) -> Decision:
+        if len(self._deferred) == self._deferred.maxlen:
+            return self._reject(Decision.DROP, "defer_full")
+        self._deferred.append(data)
+        if chat_id is not None:
+            self._deferred_chats[chat_id] = self._deferred_chats.get(chat_id, 0) + 1
+        return self._reject(Decision.DEFER, reason)
+
+    def _reject(self, decision: Decision, reason: str) -> Decision:
+        self._shed.inc(action=decision.value, reason=reason)
+        return decision
+
+    # ==================== DEFERRED ====================
+
+    def _drain(self) -> None:
+        """Re-submit deferred updates, oldest first, while load stays low"""
+        while self._deferred and not self.shedding:
+            data = self._deferred[0]
+            if not self.executor.put(data):
+                break
+            self._deferred.popleft()
+            chat_id = update_chat_id(data)
+            if chat_id is not None:
+                left = self._deferred_chats.pop(chat_id) - 1
+                if left:
+                    self._deferred_chats[chat_id] = left
+            self._update_state()
+
+    async def _drain_loop(self, interval: float = 0.1) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self._update_state()
+            self._drain()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "shedding": self.shedding,
+            "in_flight": self.executor.in_flight(),
+            "high_watermark": self.high_watermark,
+            "low_watermark": self.low_watermark,
+            "deferred": len(self._deferred),
+            "shed": self._shed.total(),
+        }
@@ -0,0 +1,112 @@
+# application/dispatch/dead_letter.py
+"""
+Dead-letter list for deliveries that could not be sent
+"""
+
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from telebot.types import InlineKeyboardMarkup
+
+from application.core import codec
+from application.core.config import settings
+from application.core.log import logger
+from application.core.metrics import metrics
+from application.database.cache import cache
+
+if TYPE_CHECKING:
+    from .delivery import Delivery, DeliveryQueue
+
+
+class DeadLetterStore:
+    """
+    Failed deliveries as JSON entries on a capped Redis list (oldest first).
+
+    Replay pops entries from the head into the delivery queue, so resends
+    are paced by the send scheduler like any other message; entries that
+    don't fit in the queue stay on the list.
+    """
+
+    def __init__(self, key: str, maxlen: int):
+        self.key = key
+        self.maxlen = maxlen
+        self._stored = metrics.counter("dead_letters_total", "Deliveries moved to the dead-letter list")
+        self._replayed = metrics.counter("dead_letters_replayed_total", "Dead letters re-queued for delivery")
+
+    async def add(self, delivery: "Delivery", error: Exception, source: str = "delivery") -> None:
+        """Persist a failed delivery; never raises"""
+        markup = delivery.reply_markup
+        entry = {
+            "id": uuid.uuid4().hex,
+            "source": source,
+            "kind": delivery.kind,
+            "chat_id": delivery.chat_id,
+            "order_id": delivery.order_id,
+            "text": delivery.text,
+            "reply_markup": markup.to_json() if isinstance(markup, InlineKeyboardMarkup) else None,
+            "attempts": delivery.attempts,
+            "error_class": type(error).__name__,
+            "error": str(error)[:500],
+            "failed_at": time.time(),
+        }
+        try:
+            async with cache.client.pipeline(transaction=False) as pipe:
+                pipe.rpush(self.key, codec.dumps(entry))
+                pipe.ltrim(self.key, -self.maxlen, -1)
+                await pipe.execute()
+            self._stored.inc(source=source, error=entry["error_class"])
+        except Exception as e:
+            logger.error(f"❌ Could not dead-letter {delivery.kind} for chat {delivery.chat_id}: {e}")
+
+    async def list(self, offset: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        raw = await cache.client.lrange(self.key, offset, offset + limit - 1)
+        return [codec.loads(item) for item in raw]
+
+    async def count(self) -> int:
+        return await cache.client.llen(self.key)
+
+    async def purge(self) -> int:
+        """Drop every entry; returns how many were removed"""
+        async with cache.client.pipeline(transaction=True) as pipe:
+            pipe.llen(self.key)
+            pipe.delete(self.key)
+            count, _ = await pipe.execute()
+        logger.warning(f"🗑️ Purged {count} dead letters")
+        return count
+
+    async def replay(self, queue: "DeliveryQueue", limit: Optional[int] = None) -> Dict[str, int]:
+        """Move up to limit entries (oldest first) back onto the delivery queue"""
+        from .delivery import Delivery  # delivery imports this module
+
+        replayed = skipped = 0
+        while limit is None or replayed < limit:
+            raw = await cache.client.lpop(self.key)
+            if raw is None:
+                break
+            try:
+                entry = codec.loads(raw)
+                delivery = Delivery(
+                    chat_id=entry["chat_id"],
+                    text=entry["text"],
+                    reply_markup=InlineKeyboardMarkup.de_json(entry["reply_markup"]) if entry.get("reply_markup") else None,
+                    kind=entry.get("kind", "message"),
+                    order_id=entry.get("order_id"),
+                )
+            except (ValueError, KeyError, TypeError) as e:
+                logger.error(f"❌ Dropping unreadable dead letter: {e}")
+                skipped += 1
+                continue
+            if not queue.put(delivery):
+                # Queue full: put it back at the head and stop
+                await cache.client.lpush(self.key, raw)
+                break
+            replayed += 1
+        self._replayed.inc(replayed)
+        if replayed:
+            logger.info(f"♻️ Replayed {replayed} dead letters")
+        return {"replayed": replayed, "skipped": skipped, "remaining": await self.count()}
+
+
+# Singleton instance
+dead_letters = DeadLetterStore(key=settings.DEAD_LETTER_KEY, maxlen=settings.DEAD_LETTER_MAX)
@@ -0,0 +1,116 @@
+# application/dispatch/decode.py
+"""
+Single-pass webhook body decoding and lazily built Update objects
+"""
+
+from typing import Any, Dict, Optional
+
+from telebot import types
+from telebot.types import Update
+
+from application.core import codec
+
+# Fields our handlers and middlewares consume; built eagerly
+EAGER_FIELDS = {
+    "message": types.Message,
+    "edited_message": types.Message,
+    "callback_query": types.CallbackQuery,
+}
+
+# Everything else is only built if something actually reads it
+LAZY_FIELDS = {
+    "channel_post": types.Message,
+    "edited_channel_post": types.Message,
+    "inline_query": types.InlineQuery,
+    "chosen_inline_result": types.ChosenInlineResult,
+    "shipping_query": types.ShippingQuery,
+    "pre_checkout_query": types.PreCheckoutQuery,
+    "poll": types.Poll,
+    "poll_answer": types.PollAnswer,
+    "my_chat_member": types.ChatMemberUpdated,
+    "chat_member": types.ChatMemberUpdated,
+    "chat_join_request": types.ChatJoinRequest,
+    "message_reaction": types.MessageReactionUpdated,
+    "message_reaction_count": types.MessageReactionCountUpdated,
+    "removed_chat_boost": types.ChatBoostRemoved,
+    "chat_boost": types.ChatBoostUpdated,
+    "business_connection": types.BusinessConnection,
+    "business_message": types.Message,
+    "edited_business_message": types.Message,
+    "deleted_business_messages": types.BusinessMessagesDeleted,
+    "purchased_paid_media": types.PaidMediaPurchased,
+}
+
+
+# Update fields that carry a message-like object with a chat
+_MESSAGE_FIELDS = (
+    "message", "edited_message", "channel_post", "edited_channel_post",
+    "business_message", "edited_business_message",
+)
+
+
+def update_chat_id(data: Dict[str, Any]) -> Optional[int]:
+    """Extract the chat (or user) id an update belongs to"""
+    for field in _MESSAGE_FIELDS:
+        message = data.get(field)
+        if message:
+            return message.get("chat", {}).get("id")
+
+    callback = data.get("callback_query")
+    if callback:
+        message = callback.get("message") or {}
+        chat_id = message.get("chat", {}).get("id")
+        return chat_id if chat_id is not None else callback.get("from", {}).get("id")
+
+    # inline_query, poll_answer, my_chat_member, ... all carry a sender
+    for value in data.values():
+        if isinstance(value, dict):
+            chat = value.get("chat") or value.get("from") or value.get("user")
+            if isinstance(chat, dict) and "id" in chat:
+                return chat["id"]
+    return None
+
+
+def decode_update(body: bytes) -> Dict[str, Any]:
+    """
+    Parse a webhook body once, straight from bytes.
+
+    Raises:
+        ValueError: body is not JSON or has no integer update_id
+    """
+    data = codec.loads(body)
+    if not isinstance(data, dict) or not isinstance(data.get("update_id"), int):
+        raise ValueError("Missing update_id")
+    return data
+
+
+class LazyUpdate(Update):
+    """
+    Update built from an already parsed dict.
+
+    Only the fields this bot handles are deserialised up front; the rest
+    are decoded from the raw dict on first attribute access (an absent
+    field resolves to None without touching telebot's de_json).
+    """
+
+    @classmethod
+    def de_json(cls, json_string):
+        if json_string is None:
+            return None
+        obj = cls.check_json(json_string, dict_copy=False)
+        update = cls.__new__(cls)
+        update.__dict__["_raw"] = obj
+        update.update_id = obj["update_id"]
+        for name, factory in EAGER_FIELDS.items():
+            raw = obj.get(name)
+            setattr(update, name, factory.de_json(raw) if raw is not None else None)
+        return update
+
+    def __getattr__(self, name: str):
+        factory = LAZY_FIELDS.get(name)
+        if factory is None:
+            raise AttributeError(name)
+        raw = self.__dict__.get("_raw", {}).get(name)
+        value = factory.de_json(raw) if raw is not None else None
+        setattr(self, name, value)
+        return value
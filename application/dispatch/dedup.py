@@ -0,0 +1,95 @@
+# application/dispatch/dedup.py
+"""
+Drop redelivered Telegram updates by update_id
+"""
+
+from collections import deque
+from typing import Deque, Set
+
+from application.core.config import settings
+from application.core.log import logger
+from application.core.metrics import metrics
+from application.database.cache import cache
+
+
+class RecentIds:
+    """Fixed-size ring of recently seen ids with O(1) membership"""
+
+    __slots__ = ("_ring", "_members")
+
+    def __init__(self, size: int):
+        self._ring: Deque[int] = deque(maxlen=size)
+        self._members: Set[int] = set()
+
+    def add(self, item: int) -> bool:
+        """Remember item; False if it was already present"""
+        if item in self._members:
+            return False
+        if len(self._ring) == self._ring.maxlen:
+            self._members.discard(self._ring[0])
+        self._ring.append(item)
+        self._members.add(item)
+        return True
+
+    def __contains__(self, item: int) -> bool:
+        return item in self._members
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+
+class UpdateDeduplicator:
+    """
+    Two-level update_id filter.
+
+    The local ring catches redeliveries to the same process for free; the
+    Redis marker makes the check hold across worker processes. It is set
+    to "processing" with a short ``lease`` when an update starts and to
+    "done" for ``ttl`` once it finishes, so an update whose process died
+    mid-handler can be taken over (e.g. by a journal reclaim) after the
+    lease, while a finished or still running one is never handled twice.
+    If Redis is unavailable the local ring is used on its own.
+    """
+
+    KEY_PREFIX = "dedup:update:"
+
+    def __init__(self, window: int, ttl: int, lease: int):
+        self.ttl = ttl
+        self.lease = lease
+        self._local = RecentIds(window)
+        self._checks = metrics.counter("updates_dedup_total", "Update de-duplication checks")
+
+    async def is_duplicate(self, update_id: int) -> bool:
+        """Claim update_id for processing; True if it was already seen or is being processed"""
+        if not self._local.add(update_id):
+            self._checks.inc(result="hit", layer="local")
+            return True
+
+        try:
+            fresh = await cache.client.set(f"{self.KEY_PREFIX}{update_id}", "processing", nx=True, ex=self.lease)
+        except Exception as e:
+            logger.warning(f"⚠️ Dedup Redis check failed for {update_id}: {e}")
+            self._checks.inc(result="miss", layer="local")
+            return False
+
+        if not fresh:
+            self._checks.inc(result="hit", layer="redis")
+            return True
+
+        self._checks.inc(result="miss", layer="redis")
+        return False
+
+    async def done(self, update_id: int) -> None:
+        """Turn the processing lease into a "done" marker for the full window"""
+        try:
+            await cache.client.set(f"{self.KEY_PREFIX}{update_id}", "done", ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"⚠️ Dedup Redis update failed for {update_id}: {e}")
+
+
+# Singleton instance
+deduplicator = UpdateDeduplicator(
+    window=settings.UPDATE_DEDUP_WINDOW,
+    ttl=settings.UPDATE_DEDUP_TTL,
+    lease=settings.UPDATE_DEDUP_LEASE,
+)
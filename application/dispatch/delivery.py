@@ -0,0 +1,317 @@
+# application/dispatch/delivery.py
+"""
+Outbound delivery queue: accepted notifications are sent in the background
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import aiohttp
+from telebot.asyncio_helper import (
+    ApiHTTPException, ApiInvalidJSONException, ApiTelegramException, RequestTimeout,
+)
+
+from application.core.bot import bot
+from application.core.config import settings
+from application.core.log import logger
+from application.core.metrics import metrics
+from application.database.cache import cache
+from application.database.order_state import order_states, status_rank
+from .dead_letter import dead_letters
+from .scheduler import send_scheduler
+
+# Order notifications that may replace each other in place (the "driver
+# found" message carries the driver's details and is never overwritten)
+COALESCE_KINDS = frozenset({"arrived", "ended"})
+
+# Accept -> Telegram confirmation, including retries
+_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+@dataclass
+class Delivery:
+    """One message to send on behalf of a backend event"""
+    chat_id: int
+    text: str
+    reply_markup: Any = None
+    kind: str = "message"
+    order_id: Optional[int] = None
+    accepted_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """
+    Seconds to wait before retrying error, or None if it is permanent.
+
+    Network failures, timeouts, 429 and 5xx are transient; other Bot API
+    errors (blocked by user, chat not found, bad markup) will not improve.
+    """
+    if isinstance(error, ApiTelegramException):
+        if error.error_code == 429:
+            return float((error.result_json.get("parameters") or {}).get("retry_after", 1))
+        return 0.0 if error.error_code >= 500 else None
+    if isinstance(error, (ApiHTTPException, ApiInvalidJSONException, RequestTimeout,
+                          aiohttp.ClientError, asyncio.TimeoutError)):
+        return 0.0
+    return None
+
+
+class DeliveryQueue:
+    """
+    Bounded per-sender queues, keyed by order (or chat when there is none).
+
+    Each sender drains its own queue serially, so one order's
+    notifications go out in the order they were accepted, while
+    different orders are sent in parallel.
+
+    Failed sends are retried up to ``max_attempts`` times with exponential
+    backoff (``base_delay * 2**n``, jittered, capped at ``max_delay``, and
+    never shorter than a 429 ``retry_after``). Waiting retries do not hold
+    a sender. Deliveries that still fail go to the dead-letter list.
+    """
+
+    def __init__(
+            self,
+            maxsize: int,
+            senders: int,
+            max_attempts: int,
+            base_delay: float,
+            max_delay: float,
+            coalesce_window: float = 0.0,
+    ):
+        self.maxsize = maxsize
+        self.senders = senders
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.coalesce_window = coalesce_window
+        self._lanes: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+        self._retries: Set[asyncio.Task] = set()
+
+        self._accepted = metrics.counter("deliveries_accepted_total", "Deliveries accepted into the queue")
+        self._rejected = metrics.counter("deliveries_rejected_total", "Deliveries rejected (queue full or stopped)")
+        self._results = metrics.counter("deliveries_total", "Delivery attempts by outcome")
+        self._coalesced = metrics.counter("deliveries_coalesced_total", "Sends saved by editing the previous message")
+        self._latency = metrics.histogram(
+            "delivery_latency_seconds", "Accept to Telegram confirmation", buckets=_LATENCY_BUCKETS
+        )
+        metrics.gauge("delivery_queue_depth", "Deliveries waiting for a sender", fn=self.depth)
+        metrics.gauge("delivery_retry_pending", "Deliveries waiting out a backoff", fn=lambda: len(self._retries))
+
+    # ==================== LIFECYCLE ====================
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        backlog = max(1, self.maxsize // self.senders)
+        self._lanes = [asyncio.Queue(maxsize=backlog) for _ in range(self.senders)]
+        self._tasks = [
+            asyncio.create_task(self._sender(i), name=f"delivery-sender-{i}")
+            for i in range(self.senders)
+        ]
+        logger.info(f"📤 Delivery queue started: {self.senders} senders, maxsize={self.maxsize}")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Send what is queued (up to timeout); pending retries are abandoned"""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(asyncio.gather(*(lane.join() for lane in self._lanes)), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Delivery queue stopped with {self.depth()} unsent messages")
+        if self._retries:
+            logger.warning(f"⚠️ Abandoning {len(self._retries)} deliveries waiting to retry")
+
+        for task in [*self._tasks, *self._retries]:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._retries, return_exceptions=True)
+        self._tasks = []
+        self._retries = set()
+        self._lanes = []
+        logger.info("🛑 Delivery queue stopped")
+
+    # ==================== INGESTION ====================
+
+    def lane_for(self, delivery: Delivery) -> int:
+        key = delivery.order_id if delivery.order_id is not None else delivery.chat_id
+        return hash(key) % self.senders
+
+    def put(self, delivery: Delivery) -> bool:
+        """Accept a delivery without waiting; False if its sender's queue is full or stopped"""
+        if not self._lanes:
+            self._rejected.inc(reason="stopped")
+            return False
+        try:
+            self._lanes[self.lane_for(delivery)].put_nowait(delivery)
+        except asyncio.QueueFull:
+            self._rejected.inc(reason="full")
+            return False
+        self._accepted.inc(kind=delivery.kind)
+        return True
+
+    # ==================== SENDING ====================
+
+    async def _sender(self, index: int) -> None:
+        lane = self._lanes[index]
+        while True:
+            delivery = await lane.get()
+            try:
+                await self._attempt(delivery)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Delivery sender {index} crashed on {delivery.kind}: {e}")
+            finally:
+                lane.task_done()
+
+    async def send(self, delivery: Delivery) -> bool:
+        """
+        Perform the Bot API call for one delivery (an edit when it can be coalesced)
+
+        Returns False, without calling the Bot API, for an order status older
+        than the order's current one (a late retry or a dead-letter replay).
+        """
+        rank = status_rank(delivery.kind)
+        if rank and delivery.order_id is not None and rank < await order_states.current_rank(delivery.order_id):
+            return False
+
+        coalesce = (
+            self.coalesce_window > 0
+            and delivery.order_id is not None
+            and delivery.kind in COALESCE_KINDS
+        )
+        if coalesce:
+            previous = await self._previous(delivery)
+            if previous is not None:
+                chat_id, message_id, shown = previous
+                if shown >= rank:
+                    # The message already shows this status or a later one
+                    return False
+                if await self._edit_previous(delivery, chat_id, message_id):
+                    return True
+
+        message = await send_scheduler.call(
+            delivery.chat_id, bot.send_message,
+            delivery.chat_id, delivery.text, reply_markup=delivery.reply_markup,
+        )
+        if coalesce:
+            await self._remember(delivery, message.message_id)
+        return True
+
+    # ==================== COALESCING ====================
+
+    def _message_key(self, order_id: int) -> str:
+        return f"order:message:{order_id}"
+
+    async def _remember(self, delivery: Delivery, message_id: int) -> None:
+        """Keep the order's last message id and the status it shows for coalesce_window seconds"""
+        try:
+            await cache.client.set(
+                self._message_key(delivery.order_id),
+                f"{delivery.chat_id}:{message_id}:{status_rank(delivery.kind)}",
+                px=int(self.coalesce_window * 1000),
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Could not remember message for order {delivery.order_id}: {e}")
+
+    async def _previous(self, delivery: Delivery) -> Optional[Tuple[int, int, int]]:
+        """(chat_id, message_id, status rank) of the order's recent message in this chat, if any"""
+        try:
+            previous = await cache.client.get(self._message_key(delivery.order_id))
+        except Exception as e:
+            logger.warning(f"⚠️ Could not look up message for order {delivery.order_id}: {e}")
+            return None
+        if not previous:
+            return None
+
+        chat_id, message_id, rank = (int(part) for part in previous.split(":"))
+        return (chat_id, message_id, rank) if chat_id == delivery.chat_id else None
+
+    async def _edit_previous(self, delivery: Delivery, chat_id: int, message_id: int) -> bool:
+        """Edit the order's recent message in place; False if a new send is needed"""
+        try:
+            await send_scheduler.call(
+                chat_id, bot.edit_message_text,
+                delivery.text, chat_id, message_id, reply_markup=delivery.reply_markup,
+            )
+        except ApiTelegramException as e:
+            if e.error_code == 429:
+                raise
+            # Deleted by the user, too old to edit, ...: fall back to a new message
+            logger.info(f"ℹ️ Edit for order {delivery.order_id} failed ({e.description}), sending instead")
+            return False
+
+        self._coalesced.inc(kind=delivery.kind)
+        await self._remember(delivery, message_id)
+        return True
+
+    async def _attempt(self, delivery: Delivery) -> None:
+        delivery.attempts += 1
+        try:
+            sent = await self.send(delivery)
+        except Exception as e:
+            wait = retry_after(e)
+            if wait is None or delivery.attempts >= self.max_attempts:
+                self._results.inc(result="failed")
+                logger.error(
+                    f"❌ Delivery of {delivery.kind} to {delivery.chat_id} failed "
+                    f"after {delivery.attempts} attempt(s): {e}"
+                )
+                await dead_letters.add(delivery, e)
+                return
+            delay = min(self.max_delay, self.base_delay * 2 ** (delivery.attempts - 1))
+            delay = max(wait, delay * random.uniform(0.5, 1.0))
+            self._results.inc(result="retried")
+            logger.warning(f"⚠️ Delivery to {delivery.chat_id} failed ({e}), retry in {delay:.1f}s")
+            task = asyncio.create_task(self._retry_later(delivery, delay))
+            self._retries.add(task)
+            task.add_done_callback(self._retries.discard)
+            return
+
+        if not sent:
+            self._results.inc(result="stale")
+            logger.info(f"ℹ️ Dropped stale {delivery.kind} for order {delivery.order_id}")
+            return
+        self._results.inc(result="delivered")
+        self._latency.observe(time.monotonic() - delivery.accepted_at)
+
+    async def _retry_later(self, delivery: Delivery, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self._lanes[self.lane_for(delivery)].put(delivery)
+
+    # ==================== STATS ====================
+
+    def depth(self) -> int:
+        return sum(lane.qsize() for lane in self._lanes)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "senders": self.senders,
+            "maxsize": self.maxsize,
+            "depth": self.depth(),
+            "lane_depths": [lane.qsize() for lane in self._lanes],
+            "retry_pending": len(self._retries),
+            "accepted": self._accepted.total(),
+            "rejected": self._rejected.total(),
+            "delivered": self._results.value(result="delivered"),
+            "stale": self._results.value(result="stale"),
+            "coalesced": self._coalesced.total(),
+            "latency_p50": self._latency.quantile(0.5),
+            "latency_p95": self._latency.quantile(0.95),
+        }
+
+
+# Singleton instance
+delivery_queue = DeliveryQueue(
+    maxsize=settings.DELIVERY_QUEUE_SIZE,
+    senders=settings.DELIVERY_SENDERS,
+    max_attempts=settings.DELIVERY_MAX_ATTEMPTS,
+    base_delay=settings.DELIVERY_BACKOFF_BASE,
+    max_delay=settings.DELIVERY_BACKOFF_MAX,
+    coalesce_window=settings.DELIVERY_COALESCE_WINDOW,
+)
@@ -0,0 +1,161 @@
+# application/dispatch/executor.py
+"""
+Per-chat ordered executor: updates are hashed by chat_id onto serial lanes
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from application.core.config import settings
+from application.core.log import logger
+from application.core.metrics import metrics
+from .admission import AdmissionController
+from .decode import update_chat_id
+from .queue import CallbackFirstQueue, UpdateQueue
+
+
+class ShardedExecutor(UpdateQueue):
+    """
+    Runs updates on N serial lanes keyed by chat_id.
+
+    Updates from one chat are processed strictly in arrival order, so
+    e.g. a contact and the following SMS code never race on StateContext,
+    while different chats run in parallel. Callback priority applies
+    within a lane: a tap goes ahead of other chats' queued updates, never
+    ahead of its own chat's or onto a worker of its own.
+    """
+
+    def __init__(self, lanes: int, backlog: int, callback_priority: bool = False):
+        super().__init__(maxsize=lanes * backlog, workers=lanes, callback_priority=callback_priority)
+        self.lanes = lanes
+        self.backlog = backlog
+        self._lanes: List[asyncio.Queue] = []
+
+        metrics.gauge("updates_lanes", "Configured executor lanes", fn=lambda: self.lanes)
+        metrics.gauge("updates_lane_depth", "Updates waiting per lane", fn=self.lane_depths)
+
+    # ==================== LIFECYCLE ====================
+
+    async def start(self) -> None:
+        """Create lanes and spawn one worker per lane"""
+        if self._tasks:
+            return
+        self._lanes = [self._new_queue(self.backlog) for _ in range(self.lanes)]
+        self._started_at = time.monotonic()
+        self._busy_seconds = 0.0
+        self._tasks = [
+            asyncio.create_task(self._lane_worker(i), name=f"update-lane-{i}")
+            for i in range(self.lanes)
+        ]
+        logger.info(f"📥 Sharded executor started: {self.lanes} lanes, backlog={self.backlog}")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Drain all lanes (up to timeout) and stop workers"""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(lane.join() for lane in self._lanes)),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Sharded executor stopped with {self.depth()} pending updates")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._lanes = []
+        logger.info("🛑 Sharded executor stopped")
+
+    # ==================== INGESTION ====================
+
+    def lane_for(self, data: Dict[str, Any]) -> int:
+        chat_id = update_chat_id(data)
+        key = chat_id if chat_id is not None else data.get("update_id", 0)
+        return hash(key) % self.lanes
+
+    def put(self, data: Dict[str, Any]) -> bool:
+        """Enqueue on the update's lane; False if that lane is full or stopped"""
+        if not self._lanes:
+            self._rejected.inc(reason="stopped")
+            return False
+        lane = self.lane_for(data)
+        enqueued_at = time.monotonic()
+        try:
+            self._lanes[lane].put_nowait((enqueued_at, data, None))
+        except asyncio.QueueFull:
+            self._rejected.inc(reason="full", lane=lane)
+            logger.warning(f"⚠️ Lane {lane} full, rejecting update {data.get('update_id')}")
+            return False
+        self._watch(data, enqueued_at)
+        self._enqueued.inc()
+        return True
+
+    async def put_wait(self, data: Dict[str, Any], on_done: Optional[Callable[[], None]] = None) -> None:
+        """Enqueue on the update's lane, waiting for free space"""
+        if not self._lanes:
+            raise RuntimeError("Sharded executor not started. Call start() first.")
+        enqueued_at = time.monotonic()
+        await self._lanes[self.lane_for(data)].put((enqueued_at, data, on_done))
+        self._watch(data, enqueued_at)
+        self._enqueued.inc()
+
+    # ==================== WORKERS ====================
+
+    async def _lane_worker(self, index: int) -> None:
+        lane = self._lanes[index]
+        while True:
+            enqueued_at, data, on_done = await lane.get()
+            try:
+                await self._run(index, enqueued_at, data)
+            finally:
+                lane.task_done()
+                if on_done is not None:
+                    on_done()
+
+    # ==================== STATS ====================
+
+    def depth(self) -> int:
+        return sum(lane.qsize() for lane in self._lanes)
+
+    def priority_depth(self) -> int:
+        return sum(lane.callbacks() for lane in self._lanes if isinstance(lane, CallbackFirstQueue))
+
+    def lane_depths(self) -> Dict[str, int]:
+        return {f"lane={i}": lane.qsize() for i, lane in enumerate(self._lanes)}
+
+    def stats(self) -> Dict[str, Any]:
+        result = super().stats()
+        result.update({
+            "lanes": self.lanes,
+            "backlog": self.backlog,
+            "lane_depths": [lane.qsize() for lane in self._lanes],
+        })
+        return result
+
+
+def create_update_queue() -> UpdateQueue:
+    """Build the configured update executor ("sharded" or "pool")"""
+    if settings.UPDATE_EXECUTOR == "pool":
+        return UpdateQueue(
+            maxsize=settings.UPDATE_QUEUE_SIZE, workers=settings.UPDATE_WORKERS,
+            callback_priority=settings.UPDATE_CALLBACK_PRIORITY,
+        )
+    return ShardedExecutor(
+        lanes=settings.UPDATE_LANES, backlog=settings.UPDATE_LANE_BACKLOG,
+        callback_priority=settings.UPDATE_CALLBACK_PRIORITY,
+    )
+
+
+# Singleton instances
+update_queue = create_update_queue()
+
+admission = AdmissionController(
+    update_queue,
+    high_watermark=settings.ADMISSION_HIGH_WATERMARK,
+    low_watermark=settings.ADMISSION_LOW_WATERMARK,
+    defer_limit=settings.ADMISSION_DEFER_LIMIT,
+    repeat_window=settings.ADMISSION_REPEAT_WINDOW,
+)
@@ -0,0 +1,201 @@
+# application/dispatch/journal.py
+"""
+Durable update journal on Redis Streams with consumer groups
+"""
+
+import asyncio
+import os
+import socket
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import redis.asyncio as redis
+
+from application.core import codec
+from application.core.config import settings
+from application.core.log import logger
+from application.core.metrics import metrics
+from application.database.cache import cache
+from .queue import UpdateQueue
+
+
+class UpdateJournal:
+    """
+    Webhook bodies are XADDed to a stream and acknowledged to Telegram at
+    once; consumer-group workers (one per process, on any node) read them
+    into the local executor and XACK after the handler chain finishes.
+
+    Entries left pending by a dead consumer for longer than ``claim_idle``
+    are taken over with XAUTOCLAIM, so a restart mid-burst loses nothing.
+    """
+
+    def __init__(
+            self,
+            stream: str,
+            group: str,
+            maxlen: int,
+            batch: int = 100,
+            block_ms: int = 1000,
+            claim_idle_ms: int = 60000,
+            claim_interval: float = 15.0,
+            consumer: Optional[str] = None,
+    ):
+        self.stream = stream
+        self.group = group
+        self.maxlen = maxlen
+        self.batch = batch
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.claim_interval = claim_interval
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self._executor: Optional[UpdateQueue] = None
+        self._acks: List[str] = []
+        self._inflight: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+
+        self._appended = metrics.counter("journal_appended_total", "Updates appended to the stream")
+        self._read = metrics.counter("journal_read_total", "Stream entries delivered to this consumer")
+        self._acked = metrics.counter("journal_acked_total", "Stream entries acknowledged")
+        self._reclaimed = metrics.counter("journal_reclaimed_total", "Entries reclaimed from idle consumers")
+        metrics.gauge("journal_unacked", "Entries processed locally but not yet XACKed", fn=lambda: len(self._acks))
+
+    @property
+    def client(self) -> redis.Redis:
+        return cache.client
+
+    # ==================== PRODUCER ====================
+
+    async def append(self, body: bytes) -> str:
+        """Append a raw (already validated) update body to the stream"""
+        entry_id = await self.client.xadd(
+            self.stream, {"u": body}, maxlen=self.maxlen, approximate=True
+        )
+        self._appended.inc()
+        return entry_id
+
+    # ==================== CONSUMER ====================
+
+    async def start(self, executor: UpdateQueue) -> None:
+        """Join the consumer group and start reading into executor"""
+        if self._tasks:
+            return
+        self._executor = executor
+        try:
+            await self.client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+        self._tasks = [
+            asyncio.create_task(self._read_loop(), name="journal-reader"),
+            asyncio.create_task(self._claim_loop(), name="journal-claimer"),
+        ]
+        logger.info(f"📒 Journal consumer '{self.consumer}' joined {self.stream}/{self.group}")
+
+    async def stop(self) -> None:
+        """Stop reading; call flush_acks() after the executor has drained"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("🛑 Journal consumer stopped")
+
+    def _done(self, entry_id: str) -> None:
+        self._inflight.discard(entry_id)
+        self._acks.append(entry_id)
+
+    async def _submit(self, entries: List[Tuple[str, Dict[str, Any]]]) -> None:
+        for entry_id, fields in entries:
+            if entry_id in self._inflight:
+                # Reclaimed from ourselves while still queued locally
+                continue
+            if not fields or "u" not in fields:
+                # Trimmed or malformed entry: nothing to process
+                self._acks.append(entry_id)
+                continue
+            try:
+                data = codec.loads(fields["u"])
+            except ValueError as e:
+                logger.error(f"❌ Bad journal entry {entry_id}: {e}")
+                self._acks.append(entry_id)
+                continue
+            self._inflight.add(entry_id)
+            await self._executor.put_wait(data, on_done=lambda eid=entry_id: self._done(eid))
+
+    async def flush_acks(self) -> None:
+        """XACK entries whose processing has finished"""
+        if not self._acks:
+            return
+        ids, self._acks = self._acks, []
+        try:
+            await self.client.xack(self.stream, self.group, *ids)
+            self._acked.inc(len(ids))
+        except Exception as e:
+            logger.error(f"❌ XACK failed for {len(ids)} entries: {e}")
+            self._acks.extend(ids)
+
+    async def _read_loop(self) -> None:
+        # Our own pending entries first (same consumer name after a reload), then new ones
+        last_id = "0"
+        while True:
+            try:
+                await self.flush_acks()
+                response = await self.client.xreadgroup(
+                    self.group, self.consumer, {self.stream: last_id},
+                    count=self.batch, block=self.block_ms,
+                )
+                entries = response[0][1] if response else []
+                if last_id != ">":
+                    if not entries:
+                        last_id = ">"
+                        continue
+                    last_id = entries[-1][0]
+                self._read.inc(len(entries))
+                await self._submit(entries)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Journal read failed: {e}")
+                await asyncio.sleep(1)
+
+    async def _claim_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.claim_interval)
+            try:
+                # Don't reclaim our own finished-but-unacked entries
+                await self.flush_acks()
+                start = "0-0"
+                while True:
+                    start, entries, *_ = await self.client.xautoclaim(
+                        self.stream, self.group, self.consumer,
+                        min_idle_time=self.claim_idle_ms, start_id=start, count=self.batch,
+                    )
+                    if entries:
+                        self._reclaimed.inc(len(entries))
+                        logger.warning(f"♻️ Reclaimed {len(entries)} idle journal entries")
+                        await self._submit(entries)
+                    if start in ("0-0", b"0-0"):
+                        break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Journal reclaim failed: {e}")
+
+    async def stats(self) -> Dict[str, Any]:
+        summary = await self.client.xpending(self.stream, self.group)
+        return {
+            "stream": self.stream,
+            "group": self.group,
+            "consumer": self.consumer,
+            "length": await self.client.xlen(self.stream),
+            "pending": summary.get("pending", 0),
+            "consumers": summary.get("consumers", []),
+        }
+
+
+# Singleton instance
+journal = UpdateJournal(
+    stream=settings.UPDATE_JOURNAL_STREAM,
+    group=settings.UPDATE_JOURNAL_GROUP,
+    maxlen=settings.UPDATE_JOURNAL_MAXLEN,
+    claim_idle_ms=settings.UPDATE_JOURNAL_CLAIM_IDLE_MS,
+)
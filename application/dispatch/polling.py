@@ -0,0 +1,122 @@
+# application/dispatch/polling.py
+"""
+Long-polling runner: an alternative to the webhook for staging and incidents
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from telebot import asyncio_helper
+
+from application.core.bot import bot
+from application.core.config import settings
+from application.core.log import logger
+from application.core.metrics import metrics
+from .executor import update_queue
+from .queue import UpdateQueue
+
+
+class PollingRunner:
+    """
+    Pipelined getUpdates loop.
+
+    As soon as a batch arrives the next getUpdates (with the advanced
+    offset) is put in flight, and the batch is dispatched into the same
+    update queue the webhook uses, so middlewares and handlers are shared.
+    """
+
+    def __init__(
+            self,
+            executor: UpdateQueue,
+            limit: int = 100,
+            timeout: int = 25,
+            allowed_updates: Optional[List[str]] = None,
+    ):
+        self.executor = executor
+        self.limit = limit
+        self.timeout = timeout
+        self.allowed_updates = allowed_updates
+        self.offset: Optional[int] = None
+        self._stopped = asyncio.Event()
+
+        self._batches = metrics.counter("polling_batches_total", "getUpdates responses received")
+        self._updates = metrics.counter("polling_updates_total", "Updates received via polling")
+        self._errors = metrics.counter("polling_errors_total", "Failed getUpdates calls")
+        self._batch_size = metrics.histogram(
+            "polling_batch_size", "Updates per getUpdates batch",
+            buckets=(0, 1, 5, 10, 25, 50, 100)
+        )
+
+    async def _fetch(self, offset: Optional[int]) -> List[Dict[str, Any]]:
+        return await asyncio_helper.get_updates(
+            bot.token,
+            offset=offset,
+            limit=self.limit,
+            timeout=self.timeout,
+            allowed_updates=self.allowed_updates,
+            request_timeout=self.timeout + 10,
+        )
+
+    async def _dispatch(self, batch: List[Dict[str, Any]]) -> None:
+        for data in batch:
+            await self.executor.put_wait(data)
+
+    async def run(self, drop_webhook: bool = True) -> None:
+        """Poll until stop() is called"""
+        if drop_webhook:
+            # getUpdates is refused while a webhook is set
+            await bot.remove_webhook()
+
+        self._stopped.clear()
+        logger.info(f"📡 Polling started (limit={self.limit}, timeout={self.timeout}s)")
+
+        pending = asyncio.create_task(self._fetch(self.offset))
+        backoff = 1.0
+        try:
+            while not self._stopped.is_set():
+                stop_waiter = asyncio.create_task(self._stopped.wait())
+                done, _ = await asyncio.wait({pending, stop_waiter}, return_when=asyncio.FIRST_COMPLETED)
+                stop_waiter.cancel()
+                if pending not in done:
+                    break
+
+                try:
+                    batch = pending.result()
+                except Exception as e:
+                    self._errors.inc()
+                    logger.error(f"❌ getUpdates failed: {e}; retrying in {backoff:.0f}s")
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 30.0)
+                    pending = asyncio.create_task(self._fetch(self.offset))
+                    continue
+
+                backoff = 1.0
+                self._batches.inc()
+                self._batch_size.observe(len(batch))
+                if batch:
+                    self.offset = batch[-1]["update_id"] + 1
+                    self._updates.inc(len(batch))
+
+                # Next request goes out before this batch is dispatched
+                pending = asyncio.create_task(self._fetch(self.offset))
+                await self._dispatch(batch)
+        finally:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+            logger.info("🛑 Polling stopped")
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+async def run_polling() -> None:
+    """Start the application stack (Redis, i18n, handlers, workers) and poll"""
+    from application.core.app import app, lifespan
+
+    async with lifespan(app):
+        runner = PollingRunner(
+            update_queue,
+            limit=settings.POLLING_LIMIT,
+            timeout=settings.POLLING_TIMEOUT,
+        )
+        await runner.run()
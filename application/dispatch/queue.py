@@ -0,0 +1,243 @@
+# application/dispatch/queue.py
+"""
+Bounded in-process update queue drained by a pool of worker tasks
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from application.core.bot import bot
+from application.core.config import settings
+from application.core.log import logger
+from application.core.metrics import metrics
+from .ack import acker
+from .decode import LazyUpdate, update_chat_id
+from .dedup import deduplicator
+
+
+class CallbackFirstQueue(asyncio.Queue):
+    """
+    FIFO queue that lets a callback query jump ahead of other chats' updates.
+
+    Items are (enqueued_at, data, on_done) tuples. A callback
+    is handed out before anything queued earlier unless its own chat has
+    an earlier update waiting, so each chat stays strictly in order.
+    """
+
+    def _init(self, maxsize):
+        self._queue = deque()
+        self._callbacks = 0
+
+    def _put(self, item):
+        self._queue.append(item)
+        if "callback_query" in item[1]:
+            self._callbacks += 1
+
+    def _get(self):
+        if self._callbacks:
+            # Lanes hold at most a backlog's worth of items; a scan is cheap
+            blocked = set()
+            for i, item in enumerate(self._queue):
+                chat_id = update_chat_id(item[1])
+                if "callback_query" in item[1] and chat_id not in blocked:
+                    del self._queue[i]
+                    self._callbacks -= 1
+                    return item
+                blocked.add(chat_id)
+        item = self._queue.popleft()
+        if "callback_query" in item[1]:
+            self._callbacks -= 1
+        return item
+
+    def _qsize(self):
+        return len(self._queue)
+
+    def callbacks(self) -> int:
+        return self._callbacks
+
+
+class UpdateQueue:
+    """
+    Accepts raw update dicts from the webhook and processes them in the
+    background so the HTTP request can be answered immediately.
+
+    With callback_priority, callback queries are taken off the queue ahead
+    of other chats' waiting updates (no extra workers). The callback ack
+    budget starts when a callback is enqueued, so the spinner is answered
+    in time even while the callback waits behind a slow handler.
+    """
+
+    def __init__(self, maxsize: int, workers: int, callback_priority: bool = False):
+        self.maxsize = maxsize
+        self.workers = workers
+        self.callback_priority = callback_priority
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._busy = 0
+        self._busy_seconds = 0.0
+        self._started_at: Optional[float] = None
+
+        self._enqueued = metrics.counter("updates_enqueued_total", "Updates accepted into the queue")
+        self._rejected = metrics.counter("updates_rejected_total", "Updates rejected by the queue")
+        self._processed = metrics.counter("updates_processed_total", "Updates processed by workers")
+        self._wait = metrics.histogram("updates_queue_wait_seconds", "Enqueue-to-start latency")
+        self._duration = metrics.histogram("updates_processing_seconds", "Handler chain duration")
+        metrics.gauge("updates_queue_depth", "Updates waiting in the queue", fn=self.depth)
+        metrics.gauge("updates_workers_busy", "Workers currently processing", fn=lambda: self._busy)
+        metrics.gauge("updates_worker_utilisation", "Share of worker time spent busy", fn=self.utilisation)
+        metrics.gauge("updates_priority_depth", "Callback queries queued ahead of messages", fn=self.priority_depth)
+
+    # ==================== LIFECYCLE ====================
+
+    async def start(self) -> None:
+        """Create the queue and spawn workers"""
+        if self._tasks:
+            return
+        self._queue = self._new_queue(self.maxsize)
+        self._started_at = time.monotonic()
+        self._busy_seconds = 0.0
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"update-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(f"📥 Update queue started: {self.workers} workers, maxsize={self.maxsize}")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Drain pending updates (up to timeout) and stop workers"""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Update queue stopped with {self.depth()} pending updates")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("🛑 Update queue stopped")
+
+    def _new_queue(self, maxsize: int) -> asyncio.Queue:
+        return CallbackFirstQueue(maxsize=maxsize) if self.callback_priority else asyncio.Queue(maxsize=maxsize)
+
+    # ==================== INGESTION ====================
+
+    @staticmethod
+    def _watch(data: Dict[str, Any], enqueued_at: float) -> None:
+        """Start the ack budget for an accepted callback query"""
+        callback_id = (data.get("callback_query") or {}).get("id")
+        if callback_id:
+            acker.watch(callback_id, enqueued_at)
+
+    def put(self, data: Dict[str, Any]) -> bool:
+        """Enqueue a raw update without waiting; False if the queue is full or stopped"""
+        if self._queue is None:
+            self._rejected.inc(reason="stopped")
+            return False
+        enqueued_at = time.monotonic()
+        try:
+            self._queue.put_nowait((enqueued_at, data, None))
+        except asyncio.QueueFull:
+            self._rejected.inc(reason="full")
+            logger.warning(f"⚠️ Update queue full, rejecting update {data.get('update_id')}")
+            return False
+        self._watch(data, enqueued_at)
+        self._enqueued.inc()
+        return True
+
+    async def put_wait(self, data: Dict[str, Any], on_done: Optional[Callable[[], None]] = None) -> None:
+        """
+        Enqueue a raw update, waiting for free space (backpressure for pull-based sources).
+
+        on_done is called once the update has been processed (successfully or not).
+        """
+        if self._queue is None:
+            raise RuntimeError("Update queue not started. Call start() first.")
+        enqueued_at = time.monotonic()
+        await self._queue.put((enqueued_at, data, on_done))
+        self._watch(data, enqueued_at)
+        self._enqueued.inc()
+
+    # ==================== WORKERS ====================
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            enqueued_at, data, on_done = await self._queue.get()
+            try:
+                await self._run(index, enqueued_at, data)
+            finally:
+                self._queue.task_done()
+                if on_done is not None:
+                    on_done()
+
+    async def _run(self, index: int, enqueued_at: float, data: Dict[str, Any]) -> None:
+        """Process one update and record timing metrics"""
+        started = time.monotonic()
+        self._wait.observe(started - enqueued_at)
+        self._busy += 1
+        callback_id = (data.get("callback_query") or {}).get("id")
+        try:
+            await self.process(data)
+            self._processed.inc(result="ok")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._processed.inc(result="error")
+            logger.error(f"❌ Worker {index} failed on update {data.get('update_id')}: {e}")
+        finally:
+            elapsed = time.monotonic() - started
+            self._duration.observe(elapsed)
+            self._busy_seconds += elapsed
+            self._busy -= 1
+            if callback_id:
+                acker.release(callback_id)
+
+    async def process(self, data: Dict[str, Any]) -> None:
+        """Run a single update through the bot's middleware and handler chain"""
+        dedup = settings.UPDATE_DEDUP_ENABLED
+        if dedup and await deduplicator.is_duplicate(data["update_id"]):
+            logger.info(f"♻️ Dropping duplicate update {data['update_id']}")
+            return
+        try:
+            await bot.process_new_updates([LazyUpdate.de_json(data)])
+        finally:
+            if dedup:
+                await deduplicator.done(data["update_id"])
+
+    # ==================== STATS ====================
+
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def priority_depth(self) -> int:
+        """Callback queries waiting ahead of other updates"""
+        queue = self._queue
+        return queue.callbacks() if isinstance(queue, CallbackFirstQueue) else 0
+
+    def in_flight(self) -> int:
+        """Queued plus currently running updates"""
+        return self.depth() + self._busy
+
+    def utilisation(self) -> float:
+        if not self._started_at or not self.workers:
+            return 0.0
+        elapsed = time.monotonic() - self._started_at
+        busy = self._busy_seconds
+        return min(1.0, busy / (elapsed * self.workers)) if elapsed > 0 else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "maxsize": self.maxsize,
+            "depth": self.depth(),
+            "busy": self._busy,
+            "utilisation": round(self.utilisation(), 4),
+            "enqueued": self._enqueued.total(),
+            "rejected": self._rejected.total(),
+            "wait_p95": self._wait.quantile(0.95),
+            "callback_priority": self.callback_priority,
+            "priority_depth": self.priority_depth(),
+            "callbacks": acker.stats(),
+        }
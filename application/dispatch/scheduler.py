@@ -0,0 +1,171 @@
+# application/dispatch/scheduler.py
+"""
+Outbound Bot API pacing: global and per-chat token buckets, 429 back-off
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from telebot.asyncio_helper import ApiTelegramException
+
+from application.core.config import settings
+from application.core.log import logger
+from application.core.metrics import metrics
+
+_WAIT_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+
+
+class TokenBucket:
+    """
+    Rate limiter in GCRA form: ``reserve()`` books the next free slot and
+    returns how long the caller has to wait for it. Up to ``burst`` calls
+    go through back to back after an idle period.
+    """
+
+    __slots__ = ("interval", "tolerance", "_tat")
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.interval = 1.0 / rate
+        self.tolerance = (max(1, burst) - 1) * self.interval
+        self._tat = 0.0
+
+    def reserve(self) -> float:
+        now = time.monotonic()
+        tat = max(self._tat, now)
+        self._tat = tat + self.interval
+        return max(0.0, tat - self.tolerance - now)
+
+    def pause(self, seconds: float) -> None:
+        """Push every future slot at least `seconds` out (429 retry_after)"""
+        self._tat = max(self._tat, time.monotonic() + seconds + self.tolerance)
+
+    def idle(self) -> bool:
+        return self._tat <= time.monotonic()
+
+
+class SendScheduler:
+    """
+    Single gate for Bot API calls that Telegram rate-limits.
+
+    Each call waits for its chat's bucket (private chats ~1/s, groups
+    ~20/min) and then for the global bucket (~30/s per bot, split across
+    worker processes). A 429 pauses the chat's bucket for ``retry_after``
+    and the call is retried up to ``max_retries`` times.
+    """
+
+    def __init__(
+            self,
+            global_rate: float,
+            global_burst: int,
+            chat_rate: float,
+            chat_burst: int,
+            group_rate: float,
+            group_burst: int,
+            max_retries: int = 2,
+    ):
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate
+        self.group_burst = group_burst
+        self.max_retries = max_retries
+        self._chats: Dict[int, TokenBucket] = {}
+        self._recent: Deque[float] = deque()
+
+        self._sends = metrics.counter("telegram_sends_total", "Paced Bot API calls by method and result")
+        self._throttled = metrics.counter("telegram_429_total", "429 Too Many Requests responses")
+        self._wait = metrics.histogram(
+            "telegram_send_wait_seconds", "Time a call waited for rate-limit slots", buckets=_WAIT_BUCKETS
+        )
+        metrics.gauge("telegram_send_rate", "Paced calls per second over the last 10s", fn=self.rate)
+        metrics.gauge("telegram_chat_buckets", "Chats with an active rate-limit bucket", fn=lambda: len(self._chats))
+
+    def _bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) > 10000:
+                # Idle buckets hold no state worth keeping
+                self._chats = {k: b for k, b in self._chats.items() if not b.idle()}
+            # Negative ids are groups, supergroups and channels
+            if chat_id < 0:
+                bucket = TokenBucket(self.group_rate, self.group_burst)
+            else:
+                bucket = TokenBucket(self.chat_rate, self.chat_burst)
+            self._chats[chat_id] = bucket
+        return bucket
+
+    async def _acquire(self, chat_id: Optional[int]) -> float:
+        waited = 0.0
+        if chat_id is not None:
+            delay = self._bucket(int(chat_id)).reserve()
+            if delay:
+                await asyncio.sleep(delay)
+                waited += delay
+        delay = self.global_bucket.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+    async def call(self, chat_id: Optional[int], fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Run a Bot API call for chat_id once both buckets allow it"""
+        method = getattr(fn, "__name__", "call")
+        attempt = 0
+        while True:
+            self._wait.observe(await self._acquire(chat_id))
+            try:
+                result = await fn(*args, **kwargs)
+            except ApiTelegramException as e:
+                if e.error_code != 429:
+                    self._sends.inc(method=method, result="error")
+                    raise
+                retry_after = float((e.result_json.get("parameters") or {}).get("retry_after", 1))
+                self._throttled.inc(method=method)
+                if chat_id is not None:
+                    self._bucket(int(chat_id)).pause(retry_after)
+                else:
+                    self.global_bucket.pause(retry_after)
+                logger.warning(f"⏳ 429 on {method} for chat {chat_id}, pausing {retry_after:.0f}s")
+                attempt += 1
+                if attempt > self.max_retries:
+                    self._sends.inc(method=method, result="throttled")
+                    raise
+                continue
+            except Exception:
+                self._sends.inc(method=method, result="error")
+                raise
+            self._sends.inc(method=method, result="ok")
+            self._mark()
+            return result
+
+    def _mark(self) -> None:
+        now = time.monotonic()
+        self._recent.append(now)
+        while self._recent and now - self._recent[0] > 10.0:
+            self._recent.popleft()
+
+    def rate(self) -> float:
+        now = time.monotonic()
+        return sum(1 for t in self._recent if now - t <= 10.0) / 10.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": self.rate(),
+            "chat_buckets": len(self._chats),
+            "throttled_429": self._throttled.total(),
+            "sends": self._sends.total(),
+            "wait_p95": self._wait.quantile(0.95),
+        }
+
+
+# Singleton instance; the global budget is shared by all worker processes
+send_scheduler = SendScheduler(
+    global_rate=settings.SEND_GLOBAL_RATE / max(1, settings.WORKERS),
+    global_burst=settings.SEND_GLOBAL_BURST,
+    chat_rate=settings.SEND_CHAT_RATE,
+    chat_burst=settings.SEND_CHAT_BURST,
+    group_rate=settings.SEND_GROUP_RATE_PER_MIN / 60.0,
+    group_burst=settings.SEND_GROUP_BURST,
+)
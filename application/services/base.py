@@ -1,15 +1,51 @@
 """
 Base service with proper HTTP session management
 """
-from typing import Optional, Dict, Any, Union
+import asyncio
+import copy
+import time
+from typing import Optional, Dict, Any, FrozenSet, Union
 import aiohttp
 
-from application.core import logger
+from application.core import codec, logger
 from application.core.config import settings
+from application.core.metrics import metrics
+from .breaker import CircuitOpenError
+from .hedging import hedger
 from .http_client import GlobalHTTPClient
+from .response_cache import CachedResponse, response_cache
+from .retry import RetryPolicy, endpoint_template, parse_retry_after, retry_budget
+from .singleflight import single_flight
+
+_DEFAULT_POLICY = RetryPolicy()
+_retries = metrics.counter("backend_retries_total", "Backend request retries by endpoint and reason")
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of params/headers for the single-flight key"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class _Retry(Exception):
+    """A retryable response seen before the last attempt"""
+
+    def __init__(self, reason: str, retry_after: Optional[float] = None):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
 
 
 class BaseService:
+    # Per-endpoint overrides: {"GET /cities/": RetryPolicy(...), "POST /sms/": NO_RETRY}
+    retry_policies: Dict[str, RetryPolicy] = {}
+    # Opt-in response cache for GETs: {"/cities/": ttl_seconds}
+    cache_ttls: Dict[str, float] = {}
+    # GET endpoint templates whose slow first attempts get a hedged second one
+    hedged_endpoints: FrozenSet[str] = frozenset()
 
     def __init__(self):
         self.base_url = f"{settings.MAIN_URL}/{settings.API_VERSION}"
@@ -26,62 +62,180 @@ class BaseService:
 
         return headers
 
+    def retry_policy(self, method: str, template: str) -> RetryPolicy:
+        return self.retry_policies.get(f"{method} {template}", _DEFAULT_POLICY)
+
     async def _request(
             self,
             method: str,
             endpoint: str,
+            *,
+            idempotency_key: Optional[str] = None,
+            retry: Optional[RetryPolicy] = None,
             **kwargs
     ) -> Dict[str, Any]:
+        method = method.upper()
         url = f"{self.base_url}{endpoint}"
 
         if "headers" in kwargs:
             kwargs["headers"] = await self.ensure_headers(kwargs["headers"])
         else:
             kwargs["headers"] = await self.ensure_headers()
+        if idempotency_key:
+            kwargs["headers"]["Idempotency-Key"] = idempotency_key
+        if "json" in kwargs:
+            # Serialise once, to bytes, with the fast codec (reused by retries)
+            kwargs["data"] = codec.dumps(kwargs.pop("json"))
+
+        template = endpoint_template(endpoint)
+        policy = retry or self.retry_policy(method, template)
+        if method != "GET":
+            return await self._call(method, url, template, policy, **kwargs)
+
+        params = _freeze(kwargs.get("params"))
+        ttl = self.cache_ttls.get(template)
+        if ttl:
+            cache_key = f"{url}|{params}"
+            cached = await response_cache.get(cache_key)
+            if cached is not None and cached.fresh():
+                response_cache.count("hit", template)
+                return copy.deepcopy(cached.data)
+
+            async def fetch():
+                return await self._revalidate(cache_key, cached, ttl, url, template, policy, **kwargs)
+        else:
+            async def fetch():
+                return await self._call(method, url, template, policy, **kwargs)
 
-        try:
-            async with self.http_client.request(method, url, **kwargs) as response:
-
-                content_type = response.headers.get("Content-Type", "").lower()
-
-                # Handle 204 No Content
-                if response.status == 204:
-                    return {}
-
-                # Handle HTML responses (unexpected)
-                if "text/html" in content_type:
-                    text = await response.text()
-                    logger.warning(f"HTML response for {url}: {text[:200]}")
-                    return {"error": f"Unexpected HTML ({response.status})"}
-
-                # Try to parse JSON
-                try:
-                    data = await response.json()
-                except aiohttp.ContentTypeError:
-                    text = await response.text()
-                    logger.warning(f"Non-JSON response for {url}: {text[:200]}")
-                    return {"error": "Non-JSON response"}
-                except Exception as e:
-                    logger.error(f"Error parsing JSON from {url}: {e}")
-                    return {"error": f"JSON parse error: {e}"}
-
-                # Check for HTTP errors
-                if not 200 <= response.status < 300:
-                    error_msg = (
-                            data.get("detail") or
-                            data.get("error") or
-                            data.get("message") or
-                            f"HTTP {response.status}"
-                    )
-                    logger.error(f"API error {response.status} from {url}: {error_msg}")
-                    raise Exception(f"API Error: {error_msg}")
-
-                return data
-
-        except aiohttp.ClientError as e:
-            logger.error(f"Network error for {url}: {e}")
-            raise Exception(f"Network error: {e}")
-        except Exception as e:
-            logger.error(f"Request error for {url}: {e}")
-            raise
+        return await single_flight.do((url, params, _freeze(kwargs["headers"])), fetch, endpoint=template)
 
+    async def _revalidate(
+            self, cache_key: str, cached: Optional[CachedResponse], ttl: float,
+            url: str, template: str, policy: RetryPolicy, **kwargs
+    ) -> Dict[str, Any]:
+        """Fetch a cacheable GET, conditionally when an expired entry has validators"""
+        if cached is not None:
+            kwargs["headers"] = {**kwargs["headers"], **cached.validators()}
+        meta: Dict[str, Any] = {}
+        data = await self._call("GET", url, template, policy, meta=meta, **kwargs)
+
+        status = meta.get("status")
+        if status == 304 and cached is not None:
+            response_cache.count("revalidated", template)
+            cached.expires_at = time.time() + ttl
+            await response_cache.set(cache_key, cached)
+            return copy.deepcopy(cached.data)
+
+        response_cache.count("miss", template)
+        # Only a parsed JSON success body; never the {"error": ...} stand-ins
+        # _send returns for HTML or non-JSON pages (e.g. a proxy's)
+        if status == 200 and meta.get("parsed") and data is not None:
+            entry = CachedResponse(
+                data=data, expires_at=time.time() + ttl,
+                etag=meta.get("etag"), last_modified=meta.get("last_modified"),
+            )
+            await response_cache.set(cache_key, entry)
+            return copy.deepcopy(data)
+        return data
+
+    async def _call(
+            self, method: str, url: str, template: str, policy: RetryPolicy,
+            meta: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> Dict[str, Any]:
+        """Send with retries according to policy"""
+        retries = policy.retries(method, bool(kwargs["headers"].get("Idempotency-Key")))
+        retry_budget.record_request()
+        hedge = method == "GET" and meta is None and template in self.hedged_endpoints
+
+        attempt = 1
+        while True:
+            last = not (retries and attempt < policy.attempts and retry_budget.can_retry())
+            try:
+                if hedge:
+                    return await hedger.run(
+                        template, lambda: self._send(method, url, template, policy, last, None, **kwargs)
+                    )
+                return await self._send(method, url, template, policy, last, meta, **kwargs)
+            except _Retry as e:
+                reason, failure = e.reason, f"API Error: {e.reason}"
+                delay = policy.backoff(attempt, e.retry_after)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if last:
+                    logger.error(f"Network error for {url}: {e}")
+                    raise Exception(f"Network error: {e}")
+                reason, failure = type(e).__name__, f"Network error: {e}"
+                delay = policy.backoff(attempt)
+            except CircuitOpenError:
+                # Already logged when the circuit opened; callers degrade
+                raise
+            except Exception as e:
+                logger.error(f"Request error for {url}: {e}")
+                raise
+
+            if delay is None or not retry_budget.withdraw():
+                _retries.inc(method=method, endpoint=template, reason="exhausted")
+                logger.error(f"{failure} from {url}, not retrying")
+                raise Exception(failure)
+            _retries.inc(method=method, endpoint=template, reason=reason)
+            logger.warning(f"⚠️ {method} {url} failed ({reason}), retry {attempt} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send(
+            self, method: str, url: str, template: str, policy: RetryPolicy, last: bool,
+            meta: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> Dict[str, Any]:
+        """
+        One attempt; raises _Retry for a retryable status unless this is the last try.
+
+        meta, when given, receives the status and cache validators, and
+        ``parsed`` is set once the body parsed as a JSON success response.
+        """
+        async with self.http_client.request(method, url, endpoint=template, **kwargs) as response:
+
+            if not last and response.status in policy.statuses:
+                raise _Retry(f"HTTP {response.status}", parse_retry_after(response.headers.get("Retry-After")))
+
+            if meta is not None:
+                meta["status"] = response.status
+                meta["etag"] = response.headers.get("ETag")
+                meta["last_modified"] = response.headers.get("Last-Modified")
+
+            content_type = response.headers.get("Content-Type", "").lower()
+
+            # Handle 204 No Content (and 304 Not Modified on revalidation)
+            if response.status in (204, 304):
+                return {}
+
+            # Handle HTML responses (unexpected)
+            if "text/html" in content_type:
+                text = await response.text()
+                logger.warning(f"HTML response for {url}: {text[:200]}")
+                return {"error": f"Unexpected HTML ({response.status})"}
+
+            # Try to parse JSON (straight from the raw bytes)
+            if "json" not in content_type:
+                text = await response.text()
+                logger.warning(f"Non-JSON response for {url}: {text[:200]}")
+                return {"error": "Non-JSON response"}
+            try:
+                body = await response.read()
+                data = codec.loads(body) if body.strip() else None
+            except Exception as e:
+                logger.error(f"Error parsing JSON from {url}: {e}")
+                return {"error": f"JSON parse error: {e}"}
+
+            # Check for HTTP errors
+            if not 200 <= response.status < 300:
+                error_msg = (
+                        data.get("detail") or
+                        data.get("error") or
+                        data.get("message") or
+                        f"HTTP {response.status}"
+                )
+                logger.error(f"API error {response.status} from {url}: {error_msg}")
+                raise Exception(f"API Error: {error_msg}")
+
+            if meta is not None:
+                meta["parsed"] = True
+            return data
@@ -0,0 +1,166 @@
+"""
+Circuit breakers for backend endpoints
+"""
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from application.core import logger
+from application.core.config import settings
+from application.core.metrics import metrics
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# Exported gauge value per state
+_STATE_VALUE = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit is open"""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit open for {endpoint}, retry in {retry_in:.0f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Breaker for one endpoint.
+
+    Closed: calls go through and outcomes are kept for ``window`` seconds;
+    once there are ``min_calls`` and the failure share reaches
+    ``failure_rate`` the circuit opens. Open: calls fail fast for
+    ``open_seconds``. Half-open: up to ``probes`` calls are let through;
+    if all succeed the circuit closes, any failure opens it again.
+    """
+
+    def __init__(
+            self,
+            endpoint: str,
+            window: float,
+            min_calls: int,
+            failure_rate: float,
+            open_seconds: float,
+            probes: int,
+    ):
+        self.endpoint = endpoint
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.probes = probes
+        self.state = CircuitState.CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = 0
+        self._probe_successes = 0
+        _state.set(0, endpoint=endpoint)
+
+    def _transition(self, state: CircuitState) -> None:
+        if state is self.state:
+            return
+        logger.warning(f"🔌 Circuit for {self.endpoint}: {self.state.value} -> {state.value}")
+        self.state = state
+        self._outcomes.clear()
+        self._failures = 0
+        self._probing = 0
+        self._probe_successes = 0
+        if state is CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        _state.set(_STATE_VALUE[state], endpoint=self.endpoint)
+        _transitions.inc(endpoint=self.endpoint, state=state.value)
+
+    def before(self) -> None:
+        """Admit a call or raise CircuitOpenError"""
+        if self.state is CircuitState.OPEN:
+            remaining = self._opened_at + self.open_seconds - time.monotonic()
+            if remaining > 0:
+                _rejected.inc(endpoint=self.endpoint)
+                raise CircuitOpenError(self.endpoint, remaining)
+            self._transition(CircuitState.HALF_OPEN)
+
+        if self.state is CircuitState.HALF_OPEN:
+            if self._probing >= self.probes:
+                _rejected.inc(endpoint=self.endpoint)
+                raise CircuitOpenError(self.endpoint, 0.0)
+            self._probing += 1
+
+    def record(self, success: Optional[bool]) -> None:
+        """Outcome of an admitted call; None = no verdict (cancelled)"""
+        if self.state is CircuitState.HALF_OPEN:
+            self._probing = max(0, self._probing - 1)
+            if success is None:
+                return
+            if not success:
+                self._transition(CircuitState.OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.probes:
+                self._transition(CircuitState.CLOSED)
+            return
+
+        if success is None or self.state is not CircuitState.CLOSED:
+            return
+        now = time.monotonic()
+        self._outcomes.append((now, success))
+        if not success:
+            self._failures += 1
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            _, ok = self._outcomes.popleft()
+            if not ok:
+                self._failures -= 1
+
+        calls = len(self._outcomes)
+        if calls >= self.min_calls and self._failures / calls >= self.failure_rate:
+            self._transition(CircuitState.OPEN)
+
+    def stats(self) -> Dict[str, Any]:
+        calls = len(self._outcomes)
+        return {
+            "state": self.state.value,
+            "calls": calls,
+            "failure_rate": self._failures / calls if calls else 0.0,
+        }
+
+
+class BreakerRegistry:
+    """One breaker per endpoint template, created on first use"""
+
+    def __init__(self, enabled: bool = True, **options):
+        self.enabled = enabled
+        self.options = options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, endpoint: str) -> Optional[CircuitBreaker]:
+        if not self.enabled:
+            return None
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(endpoint, **self.options)
+        return breaker
+
+    def stats(self) -> Dict[str, Any]:
+        return {endpoint: breaker.stats() for endpoint, breaker in self._breakers.items()}
+
+
+_state = metrics.gauge("backend_circuit_state", "Circuit state per endpoint (0 closed, 1 half-open, 2 open)")
+_transitions = metrics.counter("backend_circuit_transitions_total", "Circuit state changes by new state")
+_rejected = metrics.counter("backend_circuit_rejected_total", "Calls failed fast by an open circuit")
+
+# Singleton instance
+breakers = BreakerRegistry(
+    enabled=settings.BACKEND_BREAKER_ENABLED,
+    window=settings.BACKEND_BREAKER_WINDOW,
+    min_calls=settings.BACKEND_BREAKER_MIN_CALLS,
+    failure_rate=settings.BACKEND_BREAKER_FAILURE_RATE,
+    open_seconds=settings.BACKEND_BREAKER_OPEN_SECONDS,
+    probes=settings.BACKEND_BREAKER_PROBES,
+)
@@ -3,6 +3,9 @@ from .base import BaseService
 
 
 class CityServiceAPI(BaseService):
+    # Reference data: served from cache, revalidated after the TTL
+    cache_ttls = {"/cities/": 300, "/cities/{id}/": 300}
+
     async def get(self, page: int = 1, page_size: int = 100) -> Dict[str, Any]:
         """Get all cities with pagination"""
         return await self._request(
@@ -0,0 +1,133 @@
+"""
+Hedged backend reads: a second attempt when the first is slower than usual
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from application.core.config import settings
+from application.core.metrics import metrics
+from .retry import RetryBudget
+
+
+class LatencyWindow:
+    """Last `size` latencies of one endpoint, for a rolling percentile"""
+
+    __slots__ = ("samples", "_cached", "_dirty")
+
+    def __init__(self, size: int):
+        self.samples: Deque[float] = deque(maxlen=size)
+        self._cached: Optional[float] = None
+        self._dirty = 0
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self._dirty += 1
+
+    def percentile(self, q: float) -> float:
+        # Re-sorting is cheap at this size but not per request
+        if self._cached is None or self._dirty >= 10:
+            ordered = sorted(self.samples)
+            self._cached = ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+            self._dirty = 0
+        return self._cached
+
+
+class Hedger:
+    """
+    Runs an attempt and, if it has not answered within the endpoint's
+    rolling ``percentile`` latency, fires one more; the first successful
+    answer wins and the other is cancelled. Until ``min_samples`` latencies
+    are known nothing is hedged, and ``budget`` caps hedges to a share of
+    hedgeable requests.
+    """
+
+    def __init__(self, enabled: bool, percentile: float, min_delay: float, window: int, min_samples: int,
+                 budget: RetryBudget):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.window = window
+        self.min_samples = min_samples
+        self.budget = budget
+        self._latencies: Dict[str, LatencyWindow] = {}
+        self._hedges = metrics.counter("backend_hedges_total", "Hedged reads by outcome")
+
+    def threshold(self, endpoint: str) -> Optional[float]:
+        """Delay before hedging, or None while there is too little history"""
+        latencies = self._latencies.get(endpoint)
+        if latencies is None or len(latencies.samples) < self.min_samples:
+            return None
+        return max(self.min_delay, latencies.percentile(self.percentile))
+
+    def _record(self, endpoint: str, seconds: float) -> None:
+        latencies = self._latencies.get(endpoint)
+        if latencies is None:
+            latencies = self._latencies[endpoint] = LatencyWindow(self.window)
+        latencies.add(seconds)
+
+    async def _timed(self, endpoint: str, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        start = time.perf_counter()
+        try:
+            result = await attempt()
+        except asyncio.CancelledError:
+            # A cancelled loser took at least this long; keep the tail visible
+            self._record(endpoint, time.perf_counter() - start)
+            raise
+        self._record(endpoint, time.perf_counter() - start)
+        return result
+
+    async def run(self, endpoint: str, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled:
+            return await attempt()
+        self.budget.record_request()
+        delay = self.threshold(endpoint)
+        if delay is None:
+            return await self._timed(endpoint, attempt)
+
+        first = asyncio.ensure_future(self._timed(endpoint, attempt))
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return first.result()
+            if not self.budget.withdraw():
+                self._hedges.inc(endpoint=endpoint, result="over_budget")
+                return await first
+
+            self._hedges.inc(endpoint=endpoint, result="fired")
+            tasks.append(asyncio.ensure_future(self._timed(endpoint, attempt)))
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self._hedges.inc(endpoint=endpoint, result="hedge_won" if task is not first else "first_won")
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # retrieved; the other attempt's answer was used
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            endpoint: {"threshold": self.threshold(endpoint), "samples": len(latencies.samples)}
+            for endpoint, latencies in self._latencies.items()
+        }
+
+
+# Singleton instance
+hedger = Hedger(
+    enabled=settings.BACKEND_HEDGE_ENABLED,
+    percentile=settings.BACKEND_HEDGE_PERCENTILE,
+    min_delay=settings.BACKEND_HEDGE_MIN_DELAY,
+    window=settings.BACKEND_HEDGE_WINDOW,
+    min_samples=settings.BACKEND_HEDGE_MIN_SAMPLES,
+    budget=RetryBudget(ratio=settings.BACKEND_HEDGE_BUDGET, minimum=0),
+)
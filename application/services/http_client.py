@@ -1,10 +1,17 @@
 """
 Global HTTP client for managing aiohttp sessions
 """
+import asyncio
 import aiohttp
-from typing import Optional
+from typing import Any, Dict, Optional
 from contextlib import asynccontextmanager
 
+from application.core.config import settings
+from application.core.log import logger
+from application.core.metrics import metrics
+from .breaker import breakers
+from .tracing import RequestTimings, observe, trace_config
+
 
 class GlobalHTTPClient:
     """
@@ -21,26 +28,95 @@ class GlobalHTTPClient:
     async def get_session(self) -> aiohttp.ClientSession:
         """Get or create a shared session"""
         if self._session is None or self._session.closed:
-            timeout = aiohttp.ClientTimeout(total=30)
+            timeout = aiohttp.ClientTimeout(total=settings.BACKEND_TIMEOUT)
             connector = aiohttp.TCPConnector(
-                limit=100,
-                limit_per_host=20,
+                limit=settings.BACKEND_POOL_SIZE,
+                limit_per_host=settings.BACKEND_POOL_PER_HOST,
+                keepalive_timeout=settings.BACKEND_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=settings.BACKEND_DNS_TTL,
                 force_close=False,
                 enable_cleanup_closed=True
             )
             self._session = aiohttp.ClientSession(
                 timeout=timeout,
                 connector=connector,
-                headers={"Content-Type": "application/json"}
+                headers={"Content-Type": "application/json"},
+                trace_configs=[trace_config()],
             )
         return self._session
 
     @asynccontextmanager
-    async def request(self, method: str, url: str, **kwargs):
-        """Context manager for making requests"""
+    async def request(self, method: str, url: str, endpoint: Optional[str] = None, **kwargs):
+        """
+        Context manager for making requests
+
+        With an endpoint template the call is timed per endpoint and goes
+        through that endpoint's circuit breaker: CircuitOpenError is raised
+        instead of waiting on a failing backend, and network errors and 5xx
+        count as failures.
+        """
+        if endpoint is None:
+            session = await self.get_session()
+            async with session.request(method, url, **kwargs) as response:
+                yield response
+            return
+
+        breaker = breakers.get(endpoint)
+        if breaker is not None:
+            breaker.before()
+        timings = RequestTimings()
+        status = None
+        success = None
+        try:
+            session = await self.get_session()
+            async with session.request(method, url, trace_request_ctx=timings, **kwargs) as response:
+                status = response.status
+                success = status < 500
+                yield response
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            success = False
+            raise
+        finally:
+            if breaker is not None:
+                breaker.record(success)
+            if success is not None:
+                observe(method, endpoint, status, timings)
+
+    async def warm_up(self, url: str, count: int, timeout: float = 5.0) -> int:
+        """
+        Open `count` keep-alive connections to url's host before the first
+        user request needs them (DNS, TCP and TLS are paid here).
+
+        Returns how many requests succeeded; failures are only logged.
+        """
+        if count <= 0:
+            return 0
         session = await self.get_session()
-        async with session.request(method, url, **kwargs) as response:
-            yield response
+
+        async def touch():
+            async with session.head(url, allow_redirects=False) as response:
+                await response.read()
+
+        results = await asyncio.gather(
+            *(asyncio.wait_for(touch(), timeout) for _ in range(count)), return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            logger.warning(f"⚠️ Warmed {count - len(errors)}/{count} connections to {url}: {errors[0]}")
+        else:
+            logger.info(f"🔥 Warmed {count} connections to {url}")
+        return count - len(errors)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connections in use and idle in the shared session's pool"""
+        connector = self._session.connector if self._session and not self._session.closed else None
+        if connector is None:
+            return {"in_use": 0, "idle": 0, "limit": settings.BACKEND_POOL_SIZE,
+                    "limit_per_host": settings.BACKEND_POOL_PER_HOST}
+        # aiohttp keeps no public counters; these are its bookkeeping collections
+        in_use = len(getattr(connector, "_acquired", ()))
+        idle = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+        return {"in_use": in_use, "idle": idle, "limit": connector.limit, "limit_per_host": connector.limit_per_host}
 
     async def close(self):
         """Close the shared session"""
@@ -58,4 +134,9 @@ class GlobalHTTPClient:
                     ResourceWarning
                 )
         except:
-            pass
\ No newline at end of file
+            pass
+
+
+metrics.gauge("backend_pool_in_use", "Backend connections checked out", fn=lambda: GlobalHTTPClient().pool_stats()["in_use"])
+metrics.gauge("backend_pool_idle", "Backend keep-alive connections idle in the pool",
+              fn=lambda: GlobalHTTPClient().pool_stats()["idle"])
@@ -0,0 +1,118 @@
+"""
+Response cache for backend reads: TTL, ETag/Last-Modified revalidation,
+LRU in process with an optional Redis tier
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from application.core import codec, logger
+from application.core.config import settings
+from application.core.metrics import metrics
+from application.database.cache import cache
+
+
+@dataclass
+class CachedResponse:
+    data: Any
+    expires_at: float  # wall clock, so entries can move between processes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Cached responses keyed by URL and params.
+
+    Expired entries are kept (locally until evicted, in Redis for
+    ``stale_ttl``) so they can be revalidated with a conditional request;
+    a 304 refreshes the TTL without transferring the body again.
+    """
+
+    KEY_PREFIX = "httpcache:"
+
+    def __init__(self, maxsize: int, use_redis: bool = False, stale_ttl: int = 86400):
+        self.maxsize = maxsize
+        self.use_redis = use_redis
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._totals: Dict[str, int] = {"hit": 0, "miss": 0, "revalidated": 0}
+        self._results = metrics.counter("backend_cache_total", "Response cache lookups by outcome")
+        metrics.gauge("backend_cache_entries", "Responses held in the in-process cache", fn=lambda: len(self._entries))
+
+    def _redis_key(self, key: str) -> str:
+        return self.KEY_PREFIX + hashlib.blake2s(key.encode(), digest_size=16).hexdigest()
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if entry.fresh() or not self.use_redis:
+                return entry
+        elif not self.use_redis:
+            return None
+        # Another worker may have refreshed it
+        try:
+            raw = await cache.client.get(self._redis_key(key))
+        except Exception as e:
+            logger.warning(f"⚠️ Response cache lookup failed: {e}")
+            return entry
+        if raw is None:
+            return entry
+        shared = CachedResponse(**codec.loads(raw))
+        if entry is None or shared.expires_at > entry.expires_at:
+            self._store_local(key, shared)
+            return shared
+        return entry
+
+    async def set(self, key: str, entry: CachedResponse) -> None:
+        self._store_local(key, entry)
+        if not self.use_redis:
+            return
+        try:
+            payload = codec.dumps({
+                "data": entry.data, "expires_at": entry.expires_at,
+                "etag": entry.etag, "last_modified": entry.last_modified,
+            })
+            await cache.client.set(self._redis_key(key), payload, ex=self.stale_ttl)
+        except Exception as e:
+            logger.warning(f"⚠️ Response cache store failed: {e}")
+
+    def _store_local(self, key: str, entry: CachedResponse) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def count(self, result: str, endpoint: str) -> None:
+        """Record a lookup outcome: hit, miss or revalidated"""
+        self._totals[result] += 1
+        self._results.inc(result=result, endpoint=endpoint)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "maxsize": self.maxsize, "redis": self.use_redis, **self._totals}
+
+
+# Singleton instance
+response_cache = ResponseCache(
+    maxsize=settings.BACKEND_CACHE_SIZE,
+    use_redis=settings.BACKEND_CACHE_REDIS,
+    stale_ttl=settings.BACKEND_CACHE_STALE_TTL,
+)
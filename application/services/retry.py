@@ -0,0 +1,109 @@
+"""
+Retry policy for backend calls: which requests may be retried, backoff
+and a shared retry budget
+"""
+import random
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Deque, FrozenSet, Optional
+
+from application.core.config import settings
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+_ID_SEGMENT = re.compile(r"/(?:\d+|[0-9a-fA-F-]{32,36})(?=/|$)")
+
+
+def endpoint_template(endpoint: str) -> str:
+    """'/clients/by-telegram-id/42/?x=1' -> '/clients/by-telegram-id/{id}/' (metric label)"""
+    path = endpoint.split("?", 1)[0]
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds (delta-seconds or HTTP date); None if absent/invalid"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How one kind of request is retried.
+
+    Idempotent methods are retried on network errors, timeouts and
+    ``statuses``; POST and PATCH only when the call carries an
+    Idempotency-Key. Backoff is full jitter: ``uniform(0, base * 2**n)``
+    capped at ``max_delay``. A Retry-After longer than ``max_delay`` is
+    not waited out.
+    """
+    attempts: int = settings.BACKEND_RETRY_ATTEMPTS
+    base_delay: float = settings.BACKEND_RETRY_BASE
+    max_delay: float = settings.BACKEND_RETRY_MAX
+    methods: FrozenSet[str] = IDEMPOTENT_METHODS
+    statuses: FrozenSet[int] = RETRY_STATUSES
+
+    def retries(self, method: str, idempotency_key: bool = False) -> bool:
+        return self.attempts > 1 and (method in self.methods or idempotency_key)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """Delay before retry number `attempt` (1-based); None if not worth waiting"""
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_delay else None
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+# Turns retries off for an endpoint or a single call
+NO_RETRY = RetryPolicy(attempts=1)
+
+
+class RetryBudget:
+    """
+    Caps retries (or other extra attempts, such as hedges) at ``ratio`` of
+    requests over a sliding window (plus ``minimum`` per window), so a
+    struggling backend is not hit with a multiple of its normal load.
+    """
+
+    def __init__(self, ratio: float, minimum: int, window: float = 10.0):
+        self.ratio = ratio
+        self.minimum = minimum
+        self.window = window
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+
+    def _trim(self, now: float) -> None:
+        for events in (self._requests, self._retries):
+            while events and now - events[0] > self.window:
+                events.popleft()
+
+    def record_request(self) -> None:
+        now = time.monotonic()
+        self._trim(now)
+        self._requests.append(now)
+
+    def can_retry(self) -> bool:
+        self._trim(time.monotonic())
+        return len(self._retries) < self.minimum + self.ratio * len(self._requests)
+
+    def withdraw(self) -> bool:
+        """Spend one retry; False when the budget is exhausted"""
+        if not self.can_retry():
+            return False
+        self._retries.append(time.monotonic())
+        return True
+
+
+# Singleton instance shared by every service
+retry_budget = RetryBudget(ratio=settings.BACKEND_RETRY_BUDGET, minimum=settings.BACKEND_RETRY_MIN)
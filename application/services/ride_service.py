@@ -28,6 +28,7 @@ class Travel:
 
 
 class RideService(BaseService):
+    hedged_endpoints = frozenset({"/travels/by-telegram-id/{id}/"})
 
     async def create_travel(self, travel_data: Travel | Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -0,0 +1,82 @@
+"""
+Single-flight: identical concurrent backend reads share one upstream call
+"""
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from application.core.config import settings
+from application.core.metrics import metrics
+
+
+class _Flight:
+    __slots__ = ("task", "waiters", "shared")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+        self.shared = False
+
+
+class SingleFlight:
+    """
+    While a call for ``key`` is in flight, later callers wait for its
+    result instead of issuing their own.
+
+    The call runs in its own task, so a cancelled caller does not fail the
+    others; it is cancelled only when every waiter has gone. Errors reach
+    all waiters. A shared result is deep-copied per waiter so callers can
+    mutate what they get back.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.issued = 0
+        self.coalesced = 0
+        self._calls = metrics.counter("backend_singleflight_total", "Backend reads issued vs coalesced")
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], endpoint: str = "") -> Any:
+        if not self.enabled:
+            return await fn()
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.issued += 1
+            self._calls.inc(result="issued", endpoint=endpoint)
+        else:
+            flight.shared = True
+            self.coalesced += 1
+            self._calls.inc(result="coalesced", endpoint=endpoint)
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.task.cancelled():
+                raise
+            flight.waiters -= 1
+            if flight.waiters == 0:
+                flight.task.cancel()
+            raise
+        flight.waiters -= 1
+        return copy.deepcopy(result) if flight.shared else result
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._flights),
+            "issued": self.issued,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": self.coalesced / self.issued if self.issued else 0.0,
+        }
+
+
+# Singleton instance
+single_flight = SingleFlight(enabled=settings.BACKEND_SINGLE_FLIGHT)
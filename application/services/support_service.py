@@ -1,6 +1,9 @@
 from application.core.config import settings
 from application.core.bot import bot
 from application.core.log import logger
+from application.dispatch.dead_letter import dead_letters
+from application.dispatch.delivery import Delivery
+from application.dispatch.scheduler import send_scheduler
 
 
 async def send_support_message(user_id: int, message: str) -> bool:
@@ -15,9 +18,11 @@ async def send_support_message(user_id: int, message: str) -> bool:
         # Send to all admins
         for admin_id in settings.ADMINS:
             try:
-                await bot.send_message(admin_id, support_text)
+                await send_scheduler.call(admin_id, bot.send_message, admin_id, support_text)
             except Exception as e:
                 logger.error(e)
+                delivery = Delivery(chat_id=admin_id, text=support_text, kind="support", attempts=1)
+                await dead_letters.add(delivery, e, source="support")
 
 
         logger.info(f"Support message sent from user {user_id}")
@@ -0,0 +1,121 @@
+"""
+Backend call timing: total latency per endpoint, split into connector
+wait and server time with aiohttp tracing, plus connection churn
+"""
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+import aiohttp
+
+from application.core.metrics import metrics
+
+_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_latency = metrics.histogram(
+    "backend_request_seconds", "Backend call latency by method, endpoint and status class", buckets=_BUCKETS
+)
+_connector = metrics.histogram(
+    "backend_connector_wait_seconds", "Time to get a pooled or new connection", buckets=_BUCKETS
+)
+_server = metrics.histogram(
+    "backend_server_seconds", "Request headers sent to response headers received", buckets=_BUCKETS
+)
+
+_connections = metrics.counter("backend_connections_total", "Backend connections by event (created/reused)")
+
+# (method, endpoint, status class) seen so far, for the JSON summary
+_seen: Set[Tuple[str, str, str]] = set()
+
+
+class RequestTimings:
+    """Per-request trace context (passed as trace_request_ctx)"""
+
+    __slots__ = ("start", "connected", "sent", "received")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.connected: Optional[float] = None
+        self.sent: Optional[float] = None
+        self.received: Optional[float] = None
+
+
+def _timings(params_ctx) -> Optional[RequestTimings]:
+    ctx = params_ctx.trace_request_ctx
+    return ctx if isinstance(ctx, RequestTimings) else None
+
+
+async def _on_connected(session, params_ctx, params) -> None:
+    timings = _timings(params_ctx)
+    if timings is not None:
+        timings.connected = time.perf_counter()
+
+
+async def _on_created(session, params_ctx, params) -> None:
+    _connections.inc(event="created")
+    await _on_connected(session, params_ctx, params)
+
+
+async def _on_reused(session, params_ctx, params) -> None:
+    _connections.inc(event="reused")
+    await _on_connected(session, params_ctx, params)
+
+
+async def _on_headers_sent(session, params_ctx, params) -> None:
+    timings = _timings(params_ctx)
+    if timings is not None:
+        timings.sent = time.perf_counter()
+
+
+async def _on_request_end(session, params_ctx, params) -> None:
+    timings = _timings(params_ctx)
+    if timings is not None:
+        timings.received = time.perf_counter()
+
+
+def trace_config() -> aiohttp.TraceConfig:
+    """TraceConfig counting new vs reused connections and filling RequestTimings when given"""
+    config = aiohttp.TraceConfig()
+    config.on_connection_reuseconn.append(_on_reused)
+    config.on_connection_create_end.append(_on_created)
+    config.on_request_headers_sent.append(_on_headers_sent)
+    config.on_request_end.append(_on_request_end)
+    return config
+
+
+def status_class(status: Optional[int]) -> str:
+    return f"{status // 100}xx" if status else "error"
+
+
+def observe(method: str, endpoint: str, status: Optional[int], timings: RequestTimings) -> None:
+    """Record a finished call (status None when no response arrived)"""
+    label = status_class(status)
+    _seen.add((method, endpoint, label))
+    _latency.observe(time.perf_counter() - timings.start, method=method, endpoint=endpoint, status=label)
+    if timings.connected is not None:
+        _connector.observe(timings.connected - timings.start, endpoint=endpoint)
+    if timings.sent is not None and timings.received is not None:
+        _server.observe(timings.received - timings.sent, endpoint=endpoint)
+
+
+def connection_stats() -> Dict[str, Any]:
+    """Connection churn: share of requests that had to open a new connection"""
+    created = _connections.value(event="created")
+    reused = _connections.value(event="reused")
+    total = created + reused
+    return {"created": created, "reused": reused, "churn": created / total if total else 0.0}
+
+
+def latency_stats() -> Dict[str, Any]:
+    """p50/p95/p99 per endpoint and status class, with connector/server p95"""
+    stats: Dict[str, Any] = {}
+    for method, endpoint, label in sorted(_seen):
+        labels = {"method": method, "endpoint": endpoint, "status": label}
+        stats[f"{method} {endpoint} {label}"] = {
+            "count": _latency.count(**labels),
+            "p50": _latency.quantile(0.5, **labels),
+            "p95": _latency.quantile(0.95, **labels),
+            "p99": _latency.quantile(0.99, **labels),
+            "connector_p95": _connector.quantile(0.95, endpoint=endpoint),
+            "server_p95": _server.quantile(0.95, endpoint=endpoint),
+        }
+    return stats
@@ -20,6 +20,9 @@ class UserService:
 
 
 class TelegramUser(BaseService):
+    # Looked up on every screen; its tail latency is ours
+    hedged_endpoints = frozenset({"/clients/by-telegram-id/{id}/"})
+
     async def get_user(self, telegram_id: int) -> Optional[UserService]:
         """Get user by telegram ID"""
         try:
@@ -0,0 +1,127 @@
+"""
+JSON codec micro-benchmark on backend-shaped payloads
+
+For each payload compares what aiohttp did before (json.dumps -> str ->
+encode for request bodies, bytes -> str -> json.loads for responses) with
+every codec registered in application.core.codec (bytes in, bytes out).
+
+Payloads mirror the backend responses the bot reads: a /cities/ page with
+translations, a client record, a /travels/ list, Nominatim reverse and
+search results, plus the travel body the bot posts.
+
+Usage:
+    python -m benchmarks.bench_codec [--rounds 2000]
+"""
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from application.core import codec
+
+
+def city(i: int) -> Dict[str, Any]:
+    return {
+        "id": i,
+        "title": f"City {i}",
+        "subcategory": "viloyat" if i % 7 else "respublika",
+        "is_allowed": i % 3 != 0,
+        "latitude": 41.2995 + i / 100,
+        "longitude": 69.2401 - i / 100,
+        "translate": {"uz": f"Shahar {i}", "ru": f"Город {i}", "en": f"City {i}"},
+    }
+
+
+def travel(i: int) -> Dict[str, Any]:
+    return {
+        "id": 10_000 + i,
+        "user": 5_550_000 + i,
+        "from_location": "Toshkent",
+        "to_location": "Samarqand",
+        "travel_class": "standard",
+        "passenger": 1 + i % 4,
+        "price": "150000.00",
+        "has_woman": bool(i % 2),
+        "status": "created",
+        "created_at": "2025-11-02T09:14:07.512311+05:00",
+        "updated_at": "2025-11-02T09:14:07.512311+05:00",
+    }
+
+
+def address(i: int) -> Dict[str, Any]:
+    return {
+        "place_id": 2_000_000 + i,
+        "lat": "41.3111",
+        "lon": "69.2797",
+        "category": "place",
+        "type": "neighbourhood",
+        "importance": 0.35 - i / 100,
+        "display_name": "Olmazor mahallasi, Chilonzor tumani, Toshkent, 100115, O'zbekiston",
+        "address": {
+            "neighbourhood": "Olmazor mahallasi",
+            "city_district": "Chilonzor tumani",
+            "city": "Toshkent",
+            "postcode": "100115",
+            "country": "O'zbekiston",
+            "country_code": "uz",
+        },
+        "boundingbox": ["41.3011", "41.3211", "69.2697", "69.2897"],
+    }
+
+
+def payloads() -> List[Tuple[str, Any]]:
+    return [
+        ("cities page (100)", {"count": 100, "next": None, "previous": None,
+                               "results": [city(i) for i in range(100)]}),
+        ("client", {"id": 1, "telegram_id": 5_550_001, "full_name": "Ali Valiyev",
+                    "phone": "+998901234567", "language": "uz", "is_banned": False}),
+        ("travels (20)", [travel(i) for i in range(20)]),
+        ("nominatim reverse", address(0)),
+        ("nominatim search (5)", [address(i) for i in range(5)]),
+        ("travel create body", {k: v for k, v in travel(0).items() if k not in ("id", "created_at", "updated_at")}),
+    ]
+
+
+def stdlib_encode(obj: Any) -> bytes:
+    # aiohttp json=: json.dumps to str, then encode
+    return json.dumps(obj).encode("utf-8")
+
+
+def stdlib_decode(body: bytes) -> Any:
+    # response.json(): decode to str, then json.loads
+    return json.loads(body.decode("utf-8"))
+
+
+def bench(fn: Callable[[Any], Any], arg: Any, rounds: int) -> float:
+    """Return CPU microseconds per call"""
+    for _ in range(min(rounds, 100)):
+        fn(arg)
+    start = time.process_time()
+    for _ in range(rounds):
+        fn(arg)
+    return (time.process_time() - start) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    codecs = codec.available()
+    print(f"active codec: {codec.current.name}; rounds: {args.rounds}; CPU µs per call")
+    header = f"{'payload':<22} {'bytes':>7} {'op':<7} {'aiohttp':>9}" + "".join(f" {name:>9}" for name in codecs)
+    print(header)
+    print("-" * len(header))
+    for name, obj in payloads():
+        body = stdlib_encode(obj)
+        for op, baseline, arg in (("encode", stdlib_encode, obj), ("decode", stdlib_decode, body)):
+            base = bench(baseline, arg, args.rounds)
+            row = f"{name:<22} {len(body):>7} {op:<7} {base:>9.1f}"
+            for c in codecs.values():
+                fn = c.dumps if op == "encode" else c.loads
+                row += f" {bench(fn, arg, args.rounds):>9.1f}"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
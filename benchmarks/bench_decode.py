@@ -0,0 +1,65 @@
+"""
+Webhook body decoding micro-benchmark
+
+Compares the old path (bytes -> str -> Update.de_json, which parses again)
+with decode_update() + LazyUpdate.de_json() over recorded update payloads.
+
+Usage:
+    python -m benchmarks.bench_decode [--rounds 2000]
+"""
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from telebot.types import Update
+
+from application.dispatch.decode import LazyUpdate, decode_update
+
+PAYLOADS = Path(__file__).parent / "payloads" / "updates.jsonl"
+
+
+def load_payloads() -> List[bytes]:
+    return [line.encode("utf-8") for line in PAYLOADS.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def old_path(body: bytes):
+    return Update.de_json(body.decode("utf-8"))
+
+
+def new_path(body: bytes):
+    update = LazyUpdate.de_json(decode_update(body))
+    # process_new_updates touches every field; include that cost
+    for name in ("channel_post", "inline_query", "poll", "my_chat_member", "business_message"):
+        getattr(update, name)
+    return update
+
+
+def bench(fn: Callable[[bytes], object], bodies: List[bytes], rounds: int) -> float:
+    """Return CPU microseconds per update"""
+    for body in bodies:
+        fn(body)
+    start = time.process_time()
+    for _ in range(rounds):
+        for body in bodies:
+            fn(body)
+    return (time.process_time() - start) / (rounds * len(bodies)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    bodies = load_payloads()
+    old = bench(old_path, bodies, args.rounds)
+    new = bench(new_path, bodies, args.rounds)
+
+    print(f"payloads: {len(bodies)}, rounds: {args.rounds}")
+    print(f"old  (str + Update.de_json):          {old:8.2f} µs/update")
+    print(f"new  (decode_update + LazyUpdate):    {new:8.2f} µs/update")
+    print(f"saving: {old - new:.2f} µs/update ({(1 - new / old) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
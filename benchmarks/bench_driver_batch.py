@@ -0,0 +1,129 @@
+"""
+Driver-event ingestion: one request per event vs /passenger/batch
+
+Runs the app in-process under uvicorn with a real Redis (for the order
+state machine) and replaces the Bot API call with a sink that sleeps
+--send-ms. Every event uses a fresh order id so none are dropped as
+duplicates. Reports accept throughput and time until all are delivered.
+
+Usage:
+    python -m benchmarks.bench_driver_batch [--events 5000] [--batch 100] \\
+        [--concurrency 50] [--send-ms 30] [--redis-url redis://localhost:6379/0]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import aiohttp
+import redis.asyncio as redis
+import uvicorn
+
+from application.core.app import app
+from application.database.cache import cache
+from application.dispatch.delivery import Delivery, delivery_queue
+from benchmarks.bench_driver_events import load_translations
+
+PAYLOADS = Path(__file__).parent / "payloads" / "driver_events.jsonl"
+
+
+def make_events(count: int, base_id: int) -> List[Dict[str, Any]]:
+    templates = [json.loads(line) for line in PAYLOADS.read_text(encoding="utf-8").splitlines() if line.strip()]
+    events = []
+    for i in range(count):
+        event = dict(templates[i % len(templates)])
+        event["id"] = base_id + i
+        event["content_object"] = {**event.get("content_object", {}), "id": base_id + i}
+        events.append(event)
+    return events
+
+
+class Sink:
+    def __init__(self, expected: int, send_ms: float):
+        self.expected = expected
+        self.send_ms = send_ms
+        self.count = 0
+        self.done = asyncio.Event()
+
+    async def __call__(self, delivery: Delivery) -> bool:
+        await asyncio.sleep(self.send_ms / 1000)
+        self.count += 1
+        if self.count >= self.expected:
+            self.done.set()
+        return True
+
+
+async def run(url: str, bodies: List[bytes], path: str, events: int, concurrency: int, send_ms: float):
+    sink = Sink(events, send_ms)
+    delivery_queue.send = sink
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as session:
+        async def post(body: bytes):
+            async with semaphore:
+                while True:
+                    async with session.post(f"{url}{path}", data=body) as resp:
+                        await resp.read()
+                        if resp.status != 503:
+                            return
+                    await asyncio.sleep(0.01)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(post(b) for b in bodies))
+        accepted = time.perf_counter() - start
+        await sink.done.wait()
+        delivered = time.perf_counter() - start
+    return events / accepted, delivered
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--send-ms", type=float, default=30.0)
+    parser.add_argument("--port", type=int, default=8830)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    args = parser.parse_args()
+
+    load_translations()
+    logging.getLogger("application").setLevel(logging.ERROR)
+    cache._client = redis.from_url(args.redis_url, decode_responses=True, max_connections=args.concurrency + 50)
+    delivery_queue.maxsize = max(delivery_queue.maxsize, args.events)
+    await delivery_queue.start()
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, lifespan="off", log_level="warning"))
+    serve = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    url = f"http://127.0.0.1:{args.port}"
+
+    base = int(time.time()) * 100_000
+    single_events = make_events(args.events, base)
+    batch_events = make_events(args.events, base + args.events)
+    single = [json.dumps(e).encode() for e in single_events]
+    batches = [json.dumps(batch_events[i:i + args.batch]).encode() for i in range(0, args.events, args.batch)]
+
+    try:
+        single_rate, single_done = await run(url, single, "/passenger", args.events, args.concurrency, args.send_ms)
+        batch_rate, batch_done = await run(url, batches, "/passenger/batch", args.events, args.concurrency, args.send_ms)
+    finally:
+        server.should_exit = True
+        await serve
+        await delivery_queue.stop()
+        keys = [f"order:status:{e['id']}" for e in single_events + batch_events]
+        for i in range(0, len(keys), 1000):
+            await cache.client.delete(*keys[i:i + 1000])
+        await cache.disconnect()
+
+    print(f"events: {args.events}, batch: {args.batch}, concurrency: {args.concurrency}, "
+          f"send: {args.send_ms} ms x {delivery_queue.senders} senders")
+    print(f"single /passenger:       accept {single_rate:8.0f} events/s, all delivered in {single_done:6.2f} s")
+    print(f"batch  /passenger/batch: accept {batch_rate:8.0f} events/s, all delivered in {batch_done:6.2f} s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""
+Driver-event decode + dispatch micro-benchmark
+
+Compares the previous driver_response body (json.loads, .get() chain over
+the raw dict, if-chain on status) with render_driver_event(), which
+validates bytes against the typed schema and dispatches via a table.
+Both build the same message and keyboard; nothing is sent.
+
+Usage:
+    python -m benchmarks.bench_driver_events [--rounds 5000]
+"""
+import argparse
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from application.api.driver_found import render_driver_event
+from application.bot_app.keyboards.inline import in_car_inl, rate_trip_inl
+from application.core import i18n
+from application.core.config import settings
+from application.core.i18n import t
+
+PAYLOADS = Path(__file__).parent / "payloads" / "driver_events.jsonl"
+
+
+def load_translations() -> None:
+    """Fill the in-memory i18n tables from the locale files (no Redis needed)"""
+    for file in Path(settings.LOCALES_PATH).glob("*.json"):
+        i18n._translations[file.stem] = i18n._flatten_dict(json.loads(file.read_text(encoding="utf-8")))
+
+
+def legacy_render(notify: bytes):
+    """driver_response as it was, minus the send (and minus the empty-cars crash)"""
+    data = json.loads(notify)
+    driver = data.get('driver_details', {})
+    cars = driver.get('cars', [])
+    car = cars[0] if cars else {}
+    content_object = data.get('content_object', {})
+    lang = data.get("creator", {}).get("language", "uz")
+
+    if data.get("status") == "assigned":
+        text = t("find_driver", lang,
+                 order_id=data.get("id", 0),
+                 full_name=driver.get('full_name', None),
+                 car_model=car.get('car_model', None),
+                 car_number=car.get('car_number', None),
+                 phone=driver.get('phone', None),
+                 rating=driver.get('rating', None),
+                 from_city=driver.get('from_location', "").title(),
+                 to_city=driver.get('to_location', "").title(),
+                 passenger=content_object.get('passenger', None),
+                 price=content_object.get('price', None))
+        return data["user"], text, None
+
+    if data.get("status") == "arrived":
+        return data["user"], t("driver_arrived", lang), in_car_inl(lang, order_id=data["id"])
+
+    if data.get("status") == "ended":
+        return data["user"], t("rate_trip", lang), rate_trip_inl(lang, order_id=data["content_object"]['id'])
+
+
+def bench(fn: Callable[[bytes], object], bodies: List[bytes], rounds: int) -> float:
+    """Return CPU microseconds per event"""
+    for body in bodies:
+        fn(body)
+    start = time.process_time()
+    for _ in range(rounds):
+        for body in bodies:
+            fn(body)
+    return (time.process_time() - start) / (rounds * len(bodies)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5000)
+    args = parser.parse_args()
+
+    load_translations()
+    # The rating keyboard looks up "1".."5" as keys; keep the warnings out of the timings
+    logging.getLogger("application").setLevel(logging.ERROR)
+    bodies = [line.encode("utf-8") for line in PAYLOADS.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+    legacy = bench(legacy_render, bodies, args.rounds)
+    typed = bench(render_driver_event, bodies, args.rounds)
+
+    print(f"events: {len(bodies)} x {args.rounds} rounds")
+    print(f"legacy (json.loads + .get chain + if chain): {legacy:8.2f} us/event")
+    print(f"typed  (validate_json + dispatch table):     {typed:8.2f} us/event  ({legacy / typed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
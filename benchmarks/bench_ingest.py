@@ -0,0 +1,146 @@
+"""
+Update ingestion throughput: webhook vs long polling
+
+Both paths feed the same update queue; the handler chain is replaced by a
+counter (optionally sleeping --handler-ms) so the numbers reflect ingestion
+and dispatch overhead only. Both runs point the Bot API at the local stub,
+so nothing the dispatch path sends (e.g. callback auto-acks) reaches
+api.telegram.org.
+
+Usage:
+    python -m benchmarks.bench_ingest [--updates 5000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import copy
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import aiohttp
+import uvicorn
+from telebot import asyncio_helper
+
+from application.core.app import app
+from application.dispatch import update_queue
+from application.dispatch.decode import LazyUpdate
+from application.dispatch.polling import PollingRunner
+from benchmarks.stub_bot_api import StubBotAPI
+
+PAYLOADS = Path(__file__).parent / "payloads" / "updates.jsonl"
+
+
+def make_updates(count: int, chats: int = 500) -> List[Dict[str, Any]]:
+    templates = [json.loads(line) for line in PAYLOADS.read_text(encoding="utf-8").splitlines() if line.strip()]
+    updates = []
+    for i in range(count):
+        update = copy.deepcopy(templates[i % len(templates)])
+        update["update_id"] = 1 + i
+        for value in update.values():
+            if isinstance(value, dict):
+                chat = value.get("chat") or (value.get("message") or {}).get("chat")
+                if chat:
+                    chat["id"] = 5_000_000_000 + i % chats
+        updates.append(update)
+    return updates
+
+
+class Sink:
+    """Stands in for the handler chain and signals when everything arrived"""
+
+    def __init__(self, expected: int, handler_ms: float):
+        self.expected = expected
+        self.handler_ms = handler_ms
+        self.count = 0
+        self.done = asyncio.Event()
+
+    async def __call__(self, data: Dict[str, Any]) -> None:
+        LazyUpdate.de_json(data)
+        if self.handler_ms:
+            await asyncio.sleep(self.handler_ms / 1000)
+        self.count += 1
+        if self.count >= self.expected:
+            self.done.set()
+
+
+async def bench_webhook(updates: List[Dict[str, Any]], concurrency: int, handler_ms: float, port: int) -> float:
+    sink = Sink(len(updates), handler_ms)
+    update_queue.process = sink
+    await update_queue.start()
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning"))
+    serve = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    bodies = [json.dumps(u).encode() for u in updates]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with aiohttp.ClientSession() as session:
+        async def post(body: bytes):
+            async with semaphore:
+                while True:
+                    async with session.post(f"http://127.0.0.1:{port}/webhook", data=body) as resp:
+                        if resp.status != 503:
+                            return
+                    await asyncio.sleep(0.01)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(post(b) for b in bodies))
+        await sink.done.wait()
+        elapsed = time.perf_counter() - start
+
+    server.should_exit = True
+    await serve
+    await update_queue.stop()
+    return len(updates) / elapsed
+
+
+async def bench_polling(updates: List[Dict[str, Any]], handler_ms: float, stub: StubBotAPI) -> float:
+    sink = Sink(len(updates), handler_ms)
+    update_queue.process = sink
+    await update_queue.start()
+    stub.push(updates)
+
+    runner = PollingRunner(update_queue, limit=100, timeout=1)
+    start = time.perf_counter()
+    task = asyncio.create_task(runner.run())
+    await sink.done.wait()
+    elapsed = time.perf_counter() - start
+
+    runner.stop()
+    await task
+    await update_queue.stop()
+    return len(updates) / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--handler-ms", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8790)
+    args = parser.parse_args()
+
+    updates = make_updates(args.updates)
+
+    # Started before the webhook run too: callback auto-acks call the Bot API
+    stub = StubBotAPI(port=args.port + 1)
+    await stub.start()
+    asyncio_helper.API_URL = f"{stub.url}/bot{{0}}/{{1}}"
+    try:
+        webhook = await bench_webhook(updates, args.concurrency, args.handler_ms, args.port)
+        polling = await bench_polling(updates, args.handler_ms, stub)
+    finally:
+        await stub.stop()
+        if asyncio_helper.session_manager.session is not None:
+            await asyncio_helper.session_manager.session.close()
+
+    print(f"updates: {args.updates}, handler: {args.handler_ms} ms, executor: {type(update_queue).__name__}")
+    print(f"webhook ({args.concurrency} concurrent POSTs): {webhook:10.0f} updates/s")
+    print(f"polling (pipelined getUpdates, stub API):   {polling:10.0f} updates/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
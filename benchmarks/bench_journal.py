@@ -0,0 +1,85 @@
+"""
+Redis Streams journal throughput against a throwaway Redis
+
+Measures XADD (webhook side) and consume -> process -> XACK throughput
+with several consumer-group members. Uses a private stream name and
+deletes it afterwards, but point it at a scratch instance anyway, e.g.
+``docker run --rm -p 6390:6379 redis:7``.
+
+Usage:
+    python -m benchmarks.bench_journal --redis-url redis://localhost:6390/0 \\
+        [--updates 20000] [--consumers 4] [--concurrency 100]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import redis.asyncio as redis
+
+from application.database.cache import cache
+from application.dispatch.executor import ShardedExecutor
+from application.dispatch.journal import UpdateJournal
+from benchmarks.bench_ingest import Sink, make_updates
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default="redis://localhost:6390/0")
+    parser.add_argument("--updates", type=int, default=20000)
+    parser.add_argument("--consumers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    cache._client = redis.from_url(args.redis_url, decode_responses=True, max_connections=args.concurrency + 20)
+    stream = f"bench:journal:{os.getpid()}"
+    bodies = [json.dumps(u).encode() for u in make_updates(args.updates)]
+
+    producer = UpdateJournal(stream=stream, group="bench", maxlen=len(bodies) * 2)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def append(body: bytes):
+        async with semaphore:
+            await producer.append(body)
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(append(b) for b in bodies))
+        append_rate = len(bodies) / (time.perf_counter() - start)
+
+        sink = Sink(len(bodies), handler_ms=0)
+        members = []
+        for i in range(args.consumers):
+            executor = ShardedExecutor(lanes=16, backlog=100)
+            executor.process = sink
+            await executor.start()
+            member = UpdateJournal(stream=stream, group="bench", maxlen=len(bodies) * 2, consumer=f"bench-{i}")
+            members.append((member, executor))
+
+        start = time.perf_counter()
+        for member, executor in members:
+            await member.start(executor)
+        await sink.done.wait()
+        # Counters are shared by name across journal instances
+        while members[0][0]._acked.total() < len(bodies):
+            await asyncio.sleep(0.01)
+        consume_rate = len(bodies) / (time.perf_counter() - start)
+
+        for member, executor in members:
+            await member.stop()
+            await executor.stop()
+            await member.flush_acks()
+        pending = (await cache.client.xpending(stream, "bench"))["pending"]
+    finally:
+        await cache.client.delete(stream)
+        await cache.disconnect()
+
+    print(f"updates: {len(bodies)}, consumers: {args.consumers}, redis: {args.redis_url}")
+    print(f"append  (XADD, {args.concurrency} concurrent):  {append_rate:10.0f} updates/s")
+    print(f"consume (XREADGROUP -> process -> XACK):   {consume_rate:10.0f} updates/s")
+    print(f"left pending: {pending}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""
+End-to-end webhook throughput with 1..N uvicorn worker processes
+
+Each run starts the real app (``uvicorn --workers N``) with the Bot API
+pointed at the local stub, POSTs --updates webhook bodies, and measures
+until the bot stops calling the Bot API. Handlers, middlewares, i18n and
+keyboards all run for real; backend calls go to a closed port and fail
+fast, so the numbers reflect bot-side CPU. Needs a Redis at --redis-url
+(workers > 1 switch FSM state and throttles to Redis).
+
+Usage:
+    python -m benchmarks.bench_workers [--workers 1,2,4] [--updates 3000] \\
+        [--concurrency 64] [--redis-url redis://localhost:6379/0]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+import aiohttp
+
+from benchmarks.bench_ingest import make_updates
+from benchmarks.stub_bot_api import StubBotAPI
+
+
+async def wait_healthy(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(f"{url}/health") as resp:
+                    if resp.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not become healthy")
+
+
+async def wait_quiet(stub: StubBotAPI, quiet: float = 1.5) -> float:
+    """Wait until the Bot API has seen no calls for `quiet` seconds; returns time of the last call"""
+    last_total, last_change = -1, time.perf_counter()
+    while True:
+        total = sum(stub.calls.values())
+        if total != last_total:
+            last_total, last_change = total, time.perf_counter()
+        elif time.perf_counter() - last_change >= quiet:
+            return last_change
+        await asyncio.sleep(0.05)
+
+
+async def run(workers: int, updates: List[Dict[str, Any]], args) -> Dict[str, float]:
+    stub = StubBotAPI(port=args.port + 1)
+    await stub.start()
+    env = {
+        **os.environ,
+        "WORKERS": str(workers),
+        "BOT_API_URL": stub.url,
+        # MAIN_URL and REDIS_URL only use the demo settings in DEBUG; never
+        # let a .env with DEBUG=false send this traffic to production
+        "DEBUG": "true",
+        "REDIS_URL_DEMO": args.redis_url,
+        "REDIS_PUBLIC_URL": args.redis_url,
+        "API_PORT": "9",  # backend calls fail fast
+        "PROD_API_HOST": "http://127.0.0.1:9",
+        "CAPTURE_ENABLED": "false",
+    }
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "uvicorn", "application.core.app:app",
+        "--host", "127.0.0.1", "--port", str(args.port), "--workers", str(workers),
+        "--log-level", "warning", "--no-access-log",
+        env=env, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{args.port}"
+    try:
+        await wait_healthy(url)
+        await asyncio.sleep(1.0)  # let every worker finish its lifespan
+        stub.calls.clear()
+
+        bodies = [json.dumps(u).encode() for u in updates]
+        semaphore = asyncio.Semaphore(args.concurrency)
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as session:
+            async def post(body: bytes):
+                async with semaphore:
+                    while True:
+                        async with session.post(f"{url}/webhook", data=body) as resp:
+                            if resp.status != 503:
+                                return
+                        await asyncio.sleep(0.01)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(post(b) for b in bodies))
+            accepted = time.perf_counter() - start
+            finished = await wait_quiet(stub) - start
+    finally:
+        proc.terminate()
+        await proc.wait()
+        await stub.stop()
+
+    return {
+        "accept_rate": len(bodies) / accepted,
+        "process_rate": len(bodies) / finished,
+        "bot_api_calls": sum(stub.calls.values()),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--updates", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--port", type=int, default=8810)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    args = parser.parse_args()
+
+    counts = [int(n) for n in args.workers.split(",")]
+    results = {}
+    for i, workers in enumerate(counts):
+        # Fresh update_ids per run so the shared dedup does not drop them
+        updates = make_updates(args.updates)
+        for update in updates:
+            update["update_id"] += (int(time.time()) % 100000) * 10_000_000 + i * args.updates
+        results[workers] = await run(workers, updates, args)
+
+    base = results[counts[0]]["process_rate"]
+    print(f"updates: {args.updates}, concurrency: {args.concurrency}, cpus: {os.cpu_count()}")
+    print(f"{'workers':>8} {'accept/s':>10} {'processed/s':>12} {'speedup':>8} {'api calls':>10}")
+    for workers, r in results.items():
+        print(f"{workers:>8} {r['accept_rate']:>10.0f} {r['process_rate']:>12.0f} "
+              f"{r['process_rate'] / base:>7.2f}x {r['bot_api_calls']:>10}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+"""
+Replay captured webhook traffic against a running instance
+
+Reads capture files written with CAPTURE_ENABLED (gzip'd JSONL records of
+``{"ts", "path", "body"}``) and POSTs each body to the same path on the
+target, preserving the original inter-arrival times at 1x, scaled by
+--speed N, or as fast as --concurrency allows with --speed max.
+
+update_id is rewritten to a fresh range by default so the target's
+redelivery dedup does not drop repeated runs.
+
+Usage:
+    python -m benchmarks.replay captures/*.jsonl.gz --target http://127.0.0.1:8000 \\
+        [--speed 1|N|max] [--concurrency 50] [--path /webhook]
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+
+def load_records(paths: List[str], only: Optional[str] = None) -> List[Dict[str, Any]]:
+    records = []
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Last line of a file cut off by a crash
+                    continue
+                if only is None or record["path"] == only:
+                    records.append(record)
+    records.sort(key=lambda r: r["ts"])
+    return records
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Replayer:
+    def __init__(self, target: str, speed: Optional[float], concurrency: int, fresh_ids: bool):
+        self.target = target.rstrip("/")
+        self.speed = speed
+        self.fresh_ids = fresh_ids
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.latencies: List[float] = []
+        self.errors: Counter = Counter()
+
+    async def _send(self, session: aiohttp.ClientSession, record: Dict[str, Any]) -> None:
+        async with self.semaphore:
+            start = time.perf_counter()
+            try:
+                async with session.post(self.target + record["path"], data=record["payload"],
+                                        headers={"Content-Type": "application/json"}) as resp:
+                    await resp.read()
+                    if resp.status >= 400:
+                        self.errors[f"http_{resp.status}"] += 1
+            except Exception as e:
+                self.errors[type(e).__name__] += 1
+            self.latencies.append(time.perf_counter() - start)
+
+    async def run(self, records: List[Dict[str, Any]]) -> float:
+        id_base = int(time.time() * 1000) % 1_000_000_000 * 1000
+        for i, record in enumerate(records):
+            body = record["body"]
+            if self.fresh_ids and isinstance(body, dict) and "update_id" in body:
+                body = {**body, "update_id": id_base + i}
+            record["payload"] = json.dumps(body, ensure_ascii=False).encode()
+
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = []
+            first_ts = records[0]["ts"]
+            start = time.perf_counter()
+            for record in records:
+                if self.speed:
+                    delay = (record["ts"] - first_ts) / self.speed - (time.perf_counter() - start)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                else:
+                    # Keep the pending set bounded at max speed
+                    await self.semaphore.acquire()
+                    self.semaphore.release()
+                tasks.append(asyncio.create_task(self._send(session, record)))
+            await asyncio.gather(*tasks)
+            return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--target", default="http://127.0.0.1:8000")
+    parser.add_argument("--speed", default="1", help="time multiplier, or 'max'")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--path", default=None, help="replay only this path, e.g. /webhook")
+    parser.add_argument("--keep-ids", action="store_true", help="send the captured update_id values")
+    args = parser.parse_args()
+
+    speed = None if args.speed == "max" else float(args.speed)
+    records = load_records(args.files, args.path)
+    if not records:
+        parser.error("no records to replay")
+
+    replayer = Replayer(args.target, speed, args.concurrency, fresh_ids=not args.keep_ids)
+    elapsed = await replayer.run(records)
+
+    latencies = replayer.latencies
+    by_path = Counter(r["path"] for r in records)
+    print(f"requests: {len(records)} ({', '.join(f'{p}={n}' for p, n in by_path.items())})")
+    print(f"speed: {args.speed}, concurrency: {args.concurrency}, target: {args.target}")
+    print(f"elapsed: {elapsed:.2f} s, throughput: {len(records) / elapsed:.0f} req/s")
+    print(f"latency p50/p95/p99: {percentile(latencies, 0.50) * 1000:.1f} / "
+          f"{percentile(latencies, 0.95) * 1000:.1f} / {percentile(latencies, 0.99) * 1000:.1f} ms")
+    print(f"errors: {sum(replayer.errors.values())} {dict(replayer.errors) or ''}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
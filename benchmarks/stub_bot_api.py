@@ -0,0 +1,142 @@
+"""
+Minimal local stand-in for the Telegram Bot API
+
+Serves getUpdates (long polling with offset semantics) from an in-memory
+backlog and acknowledges every other method with a plausible result, so
+the polling runner and outbound calls can be exercised offline.
+
+Usage:
+    python -m benchmarks.stub_bot_api --port 8081
+    BOT_API_URL=http://127.0.0.1:8081 python main.py --polling
+
+    # push updates for the bot to receive
+    curl -XPOST localhost:8081/stub/updates -d @benchmarks/payloads/updates.jsonl
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+BOT_USER = {"id": 8533767944, "is_bot": True, "first_name": "RideNow", "username": "ridenow_bot"}
+
+
+class StubBotAPI:
+    """In-memory Bot API with a pushable update backlog"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8081):
+        self.host = host
+        self.port = port
+        self.updates: List[Dict[str, Any]] = []
+        self.calls: Counter = Counter()
+        self.sent: List[Dict[str, Any]] = []
+        self._arrived = asyncio.Event()
+        self._message_id = 1000
+        self._runner = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def push(self, updates: List[Dict[str, Any]]) -> None:
+        self.updates.extend(updates)
+        self._arrived.set()
+
+    # ==================== HANDLERS ====================
+
+    async def _params(self, request: web.Request) -> Dict[str, Any]:
+        params = dict(request.query)
+        if request.can_read_body:
+            if request.content_type == "application/json":
+                params.update(await request.json())
+            else:
+                params.update(await request.post())
+        return params
+
+    async def get_updates(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        offset = int(params.get("offset") or 0)
+        limit = int(params.get("limit") or 100)
+        timeout = float(params.get("timeout") or 0)
+
+        # Confirming an offset forgets everything before it
+        if offset:
+            self.updates = [u for u in self.updates if u["update_id"] >= offset]
+
+        deadline = time.monotonic() + timeout
+        while not self.updates and time.monotonic() < deadline:
+            self._arrived.clear()
+            try:
+                await asyncio.wait_for(self._arrived.wait(), timeout=deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                break
+        return self.updates[:limit]
+
+    def _message(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self._message_id += 1
+        return {
+            "message_id": self._message_id,
+            "from": BOT_USER,
+            "chat": {"id": int(params.get("chat_id", 0)), "type": "private"},
+            "date": int(time.time()),
+            "text": params.get("text", ""),
+        }
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        params = await self._params(request)
+        self.calls[method] += 1
+
+        if method == "getUpdates":
+            result: Any = await self.get_updates(params)
+        elif method == "getMe":
+            result = BOT_USER
+        elif method in ("sendMessage", "editMessageText"):
+            self.sent.append({"method": method, **params})
+            result = self._message(params)
+        else:
+            result = True
+        return web.json_response({"ok": True, "result": result})
+
+    async def push_handler(self, request: web.Request) -> web.Response:
+        body = await request.text()
+        updates = [json.loads(line) for line in body.splitlines() if line.strip()]
+        self.push(updates)
+        return web.json_response({"ok": True, "queued": len(self.updates)})
+
+    async def stats_handler(self, request: web.Request) -> web.Response:
+        return web.json_response({"calls": dict(self.calls), "pending": len(self.updates), "sent": len(self.sent)})
+
+    # ==================== LIFECYCLE ====================
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("*", "/bot{token}/{method}", self.handle)
+        app.router.add_post("/stub/updates", self.push_handler)
+        app.router.add_get("/stub/stats", self.stats_handler)
+        return app
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    args = parser.parse_args()
+
+    stub = StubBotAPI(args.host, args.port)
+    web.run_app(stub.app(), host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
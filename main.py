@@ -1,11 +1,39 @@
+import argparse
+import asyncio
+import os
+
 import uvicorn
 from application.core.config import settings
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Passenger Bot")
+    parser.add_argument(
+        "--polling",
+        action="store_true",
+        help="Receive updates via getUpdates long polling instead of the webhook"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of uvicorn worker processes (state moves to Redis when > 1)"
+    )
+    args = parser.parse_args()
+
+    if args.workers is not None:
+        # Worker processes read settings from the environment
+        os.environ["WORKERS"] = str(args.workers)
+        settings.WORKERS = args.workers
 
-    uvicorn.run(
-        "application.core.app:app",
-        host=settings.HOST,
-        port=settings.PORT,
-        reload=settings.DEBUG
-    )
\ No newline at end of file
+    if args.polling:
+        from application.dispatch.polling import run_polling
+        asyncio.run(run_polling())
+    else:
+        uvicorn.run(
+            "application.core.app:app",
+            host=settings.HOST,
+            port=settings.PORT,
+            workers=settings.WORKERS,
+            # Reload and multiple workers are mutually exclusive in uvicorn
+            reload=settings.DEBUG and settings.WORKERS == 1
+        )